@@ -1,21 +1,68 @@
 
-from fastapi import APIRouter, Depends, HTTPException, status
+import math
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from services.user_service import UserService
 from fastapi.security import OAuth2PasswordRequestForm
-from core.security import create_access_token, create_refresh_token
+from core.security import access_token_backend, create_access_token, create_refresh_token, decode_refresh_token
 from schemas.auth_schema import TokenSchema, TokenData
-from api.dependencies.user_deps import get_current_user
+from api.dependencies.user_deps import decode_token, get_current_user, oauth_reusable
 from models.user import User
 from schemas.user_schema import UserResponse
-from jose import JWTError, jwt
 from core.config import settings
 from fastapi import Body
+from core.metrics import LOGIN_ATTEMPTS
+from core.rate_limit import ConcurrencyLimiter, RateLimiter, create_rate_limit_backend
+from services.token_service import revocation_store
+from typing import Optional
 
 auth_router = APIRouter()
 
+rate_limit_backend = create_rate_limit_backend(
+    settings.RATE_LIMIT_BACKEND,
+    maxsize=settings.RATE_LIMIT_MAX_KEYS,
+    redis_url=settings.RATE_LIMIT_REDIS_URL,
+)
+login_ip_limiter = RateLimiter(
+    rate_limit_backend,
+    "login:ip",
+    capacity=settings.LOGIN_RATE_LIMIT_IP_BURST,
+    per_minute=settings.LOGIN_RATE_LIMIT_IP_PER_MINUTE,
+)
+login_username_limiter = RateLimiter(
+    rate_limit_backend,
+    "login:username",
+    capacity=settings.LOGIN_RATE_LIMIT_USERNAME_BURST,
+    per_minute=settings.LOGIN_RATE_LIMIT_USERNAME_PER_MINUTE,
+)
+password_admission = ConcurrencyLimiter(settings.LOGIN_MAX_CONCURRENT_VERIFICATIONS)
+
+
+def _reject_login(result: str, retry_after: float):
+    LOGIN_ATTEMPTS.labels(result).inc()
+    raise HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Muitas tentativas de login. Tente novamente mais tarde.",
+        headers={"Retry-After": str(max(math.ceil(retry_after), 1))},
+    )
+
+
 @auth_router.post("/login", summary="Login to get access token", response_model=TokenSchema)
-async def login(data : OAuth2PasswordRequestForm = Depends()):
-    user = await UserService.authenticate_user(data.username, data.password)
+async def login(request: Request, data : OAuth2PasswordRequestForm = Depends()):
+    client_ip = request.client.host if request.client else "unknown"
+    allowed, retry_after = await login_ip_limiter.hit(client_ip)
+    if not allowed:
+        _reject_login("rejected_ip", retry_after)
+    allowed, retry_after = await login_username_limiter.hit(data.username.strip().lower())
+    if not allowed:
+        _reject_login("rejected_username", retry_after)
+    if not password_admission.try_acquire():
+        _reject_login("rejected_concurrency", settings.LOGIN_SHED_RETRY_AFTER_SECONDS)
+
+    LOGIN_ATTEMPTS.labels("admitted").inc()
+    try:
+        user = await UserService.authenticate_user(data.username, data.password)
+    finally:
+        password_admission.release()
     if not user:
         raise HTTPException(status_code=401, detail="E-mail ou senha inválidos.")
     
@@ -29,17 +76,29 @@ async def login(data : OAuth2PasswordRequestForm = Depends()):
 async def test_token(user: User = Depends(get_current_user)):   
     return user
 
-@auth_router.post("/refresh-token", summary="Refresh access token", response_model=TokenSchema)
-async def refresh_token(refresh_token: str = Body(...)) -> TokenSchema:
+def _decode_refresh_token(refresh_token: str) -> TokenData:
     try:
-        payload = jwt.decode(refresh_token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        token_data = TokenData(**payload)
+        return TokenData(**decode_refresh_token(refresh_token))
     except:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Invalid refresh token",
             headers={"WWW-Authenticate": "Bearer"}
         )
+
+@auth_router.get("/jwks", summary="Public keys to verify access tokens")
+async def jwks():
+    return {"keys": access_token_backend().jwks()}
+
+@auth_router.post("/refresh-token", summary="Refresh access token", response_model=TokenSchema)
+async def refresh_token(refresh_token: str = Body(...)) -> TokenSchema:
+    token_data = _decode_refresh_token(refresh_token)
+    if not token_data.jti or revocation_store.is_revoked(token_data.jti, token_data.sub, token_data.iat):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Refresh token revogado",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
     
     user = await UserService.get_user_by_id(token_data.sub)
     if not user:
@@ -48,8 +107,33 @@ async def refresh_token(refresh_token: str = Body(...)) -> TokenSchema:
             detail="User not found",
             headers={"WWW-Authenticate": "Bearer"}
         )
+
+    if not await revocation_store.revoke(token_data.jti, token_data.sub, token_data.exp):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Refresh token revogado",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
         
     return {
         "access_token": create_access_token(user.id),
         "refresh_token": create_refresh_token(user.id),
-    }
\ No newline at end of file
+    }
+
+@auth_router.post("/logout", summary="Revoke the current tokens", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    user: User = Depends(get_current_user),
+    token: str = Depends(oauth_reusable),
+    refresh_token: Optional[str] = Body(None, embed=True),
+    everywhere: bool = Body(False, embed=True),
+):
+    if everywhere:
+        await revocation_store.revoke_user(str(user.id))
+        return
+    token_data = decode_token(token)
+    if token_data.jti:
+        await revocation_store.revoke(token_data.jti, token_data.sub, token_data.exp)
+    if refresh_token:
+        refresh_data = _decode_refresh_token(refresh_token)
+        if refresh_data.jti and refresh_data.sub == token_data.sub:
+            await revocation_store.revoke(refresh_data.jti, refresh_data.sub, refresh_data.exp)
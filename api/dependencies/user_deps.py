@@ -1,13 +1,16 @@
 from fastapi.security import OAuth2PasswordBearer
 from pydantic import ValidationError
 from core.config import settings
-from fastapi import Body, Depends, HTTPException, status
+from fastapi import Body, Depends, HTTPException, Request, status
 from typing import Optional
-from jose import JWTError, jwt
+from core.jwt_backends import InvalidTokenError
+from core.security import decode_access_token
 from models.user import User
 from datetime import datetime
 from schemas.auth_schema import TokenData, TokenSchema
 from services.user_service import UserService
+from core.cache import TTLCache
+from services.token_service import revocation_store
 
 oauth_reusable = OAuth2PasswordBearer(
     tokenUrl="/auth/login",
@@ -15,8 +18,24 @@ oauth_reusable = OAuth2PasswordBearer(
     auto_error=False
 )
 
+token_cache = TTLCache(maxsize=settings.TOKEN_CACHE_SIZE, ttl=settings.TOKEN_CACHE_TTL_SECONDS)
+
+
+def decode_token(token: str) -> TokenData:
+    token_data = token_cache.get(token)
+    if token_data is None:
+        payload = decode_access_token(token)
+        token_data = TokenData(**payload)
+        ttl = token_data.exp - datetime.now().timestamp() if token_data.exp else None
+        token_cache.set(token, token_data, ttl=ttl)
+    return token_data
+
+
+async def get_current_user(request: Request, token: str = Depends(oauth_reusable)) -> User:
+    current_user = getattr(request.state, "current_user", None)
+    if current_user is not None:
+        return current_user
 
-async def get_current_user(token: str = Depends(oauth_reusable)) -> User:
     if(token ==  str(None)):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -24,14 +43,27 @@ async def get_current_user(token: str = Depends(oauth_reusable)) -> User:
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-    token_data = TokenData(**payload)
+    try:
+        token_data = decode_token(token)
+    except (InvalidTokenError, ValidationError):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token inválido",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     if datetime.fromtimestamp(token_data.exp) < datetime.now():
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token has expired",
             headers={"WWW-Authenticate": "Bearer"},
             )     
+
+    if revocation_store.is_revoked(token_data.jti, token_data.sub, token_data.iat):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token revogado",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
         
     user = await UserService.get_user_by_id(token_data.sub)
     if not user:
@@ -41,6 +73,7 @@ async def get_current_user(token: str = Depends(oauth_reusable)) -> User:
             headers={"WWW-Authenticate": "Bearer"}
         )
     
+    request.state.current_user = user
     return user
 
 
@@ -1,51 +1,179 @@
-from fastapi import FastAPI, APIRouter, Depends
+from fastapi import FastAPI, APIRouter, Body, Depends, Header, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from typing import List, Literal, Optional
+from core.streaming import EXPORT_MEDIA_TYPES, read_import_rows
 from services.client_service import ClientService
-from models.client import ClientCreateUpdate
+from models.client import ClientCreateUpdate, ClientPatch
+from schemas.client_schema import clientETag
+from core.exceptions import PreconditionFailedError
 from models.response_model import ResponseModel
+from core.responses import envelope
+from core.conditional import apply_validators, is_not_modified, not_modified
 from api.dependencies.user_deps import get_current_user
 
 client_router = APIRouter(dependencies=[Depends(get_current_user)])
 service = ClientService()
 
 @client_router.get('/clients')
-async def list_clients():
+async def list_clients(
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1),
+    fields: Optional[str] = Query(None, description="Campos separados por vírgula, ex: name,email"),
+):
     try:
-        data = await service.list_clients()
+        version, etag, last_modified = await service.list_validators(cursor=cursor, limit=limit, fields=fields)
+        if is_not_modified(request, etag, last_modified):
+            return not_modified(etag, last_modified)
+        data = await service.list_clients(cursor=cursor, limit=limit, fields=fields, version=version)
+        return apply_validators(envelope(data=data), response, etag, last_modified)
+    except ValueError as ve:
+        return envelope(success=False, error=str(ve))
+    except Exception as e:
+        return envelope(success=False, error=str(e))
+
+@client_router.get('/search')
+async def search_clients(
+    q: str = Query(..., min_length=1),
+    mode: Literal["auto", "text", "name", "email", "phone"] = "auto",
+    city: Optional[str] = None,
+    state: Optional[str] = None,
+    disabled: bool = False,
+    limit: Optional[int] = Query(None, ge=1),
+    offset: int = Query(0, ge=0),
+):
+    try:
+        data = await service.search_clients(
+            q, mode=mode, city=city, state=state, disabled=disabled, limit=limit, offset=offset
+        )
+        return envelope(data=data)
+    except ValueError as ve:
+        return envelope(success=False, error=str(ve))
+    except Exception as e:
+        return envelope(success=False, error=str(e))
+
+@client_router.get('/cache/stats')
+async def client_cache_stats():
+    return ResponseModel.build(data=service.cache_stats())
+
+@client_router.get('/stats')
+async def client_stats(
+    days: Optional[int] = Query(None, ge=1, le=366),
+    top: int = Query(20, ge=1, le=100),
+):
+    try:
+        data = await service.client_stats(days=days, top=top)
         return ResponseModel.build(data=data)
     except Exception as e:
         return ResponseModel.build(success=False, error=str(e))
 
+@client_router.get('/changes', summary="Server-Sent Events feed of client inserts, updates and deletes")
+async def client_changes(last_event_id: Optional[str] = Header(None)):
+    return StreamingResponse(
+        service.stream_changes(last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@client_router.get('/export')
+async def export_clients(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    batch_size: Optional[int] = Query(None, ge=1),
+):
+    return StreamingResponse(
+        service.export_clients(format, batch_size),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="clients.{format}"'},
+    )
+
 @client_router.post('/client')
-async def create_client(client: ClientCreateUpdate):
+async def create_client(
+    client: ClientCreateUpdate,
+    response_mode: Literal["entity", "page"] = "entity",
+    limit: Optional[int] = Query(None, ge=1),
+):
     try:
-        data = await service.create_client(client)
+        data = await service.create_client(client, response_mode=response_mode, limit=limit)
         return ResponseModel.build(data=data)
     except ValueError as ve:
         return ResponseModel.build(success=False, error=str(ve))
     except Exception as e:
         return ResponseModel.build(success=False, error=str(e))
 
-@client_router.get('/client/{client_id}')
-async def get_client(client_id):
+@client_router.post('/bulk', summary="Import clients from a JSON array, NDJSON or CSV upload")
+async def import_clients(request: Request):
     try:
-        data = await service.get_client(client_id)
+        rows = await read_import_rows(request)
+        data = await service.import_clients(rows)
         return ResponseModel.build(data=data)
     except ValueError as ve:
         return ResponseModel.build(success=False, error=str(ve))
     except Exception as e:
         return ResponseModel.build(success=False, error=str(e))
 
+@client_router.post('/batch', summary="Fetch up to BATCH_MAX_IDS clients by id")
+async def get_clients_batch(ids: List[str] = Body(..., embed=True)):
+    try:
+        data = await service.get_clients_batch(ids)
+        return envelope(data=data)
+    except ValueError as ve:
+        return envelope(success=False, error=str(ve))
+    except Exception as e:
+        return envelope(success=False, error=str(e))
+
+@client_router.get('/client/{client_id}')
+async def get_client(client_id, request: Request, response: Response):
+    try:
+        etag, last_modified, revision = await service.client_validators(client_id) or (None, None, None)
+        if etag and is_not_modified(request, etag, last_modified):
+            return not_modified(etag, last_modified)
+        data = await service.get_client(client_id, revision)
+        return apply_validators(ResponseModel.build(data=data), response, clientETag(data), last_modified)
+    except ValueError as ve:
+        return ResponseModel.build(success=False, error=str(ve))
+    except Exception as e:
+        return ResponseModel.build(success=False, error=str(e))
+
 @client_router.put('/client/{client_id}')
-async def update_client(client_id, client: ClientCreateUpdate):
+async def update_client(
+    client_id,
+    client: ClientCreateUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
+):
+    try:
+        data = await service.update_client(client_id, client, if_match=if_match)
+        response.headers["ETag"] = clientETag(data)
+        return ResponseModel.build(data=data)
+    except PreconditionFailedError as pe:
+        response.status_code = status.HTTP_412_PRECONDITION_FAILED
+        return ResponseModel.build(success=False, error=str(pe))
+    except ValueError as ve:
+        return ResponseModel.build(success=False, error=str(ve))
+    except Exception as e:
+        return ResponseModel.build(success=False, error=str(e))
+
+@client_router.patch('/client/{client_id}')
+async def patch_client(
+    client_id,
+    client: ClientPatch,
+    response: Response,
+    if_match: Optional[str] = Header(None),
+):
     try:
-        data = await service.update_client(client_id, client)
+        data = await service.patch_client(client_id, client, if_match=if_match)
+        response.headers["ETag"] = clientETag(data)
         return ResponseModel.build(data=data)
+    except PreconditionFailedError as pe:
+        response.status_code = status.HTTP_412_PRECONDITION_FAILED
+        return ResponseModel.build(success=False, error=str(pe))
     except ValueError as ve:
         return ResponseModel.build(success=False, error=str(ve))
     except Exception as e:
         return ResponseModel.build(success=False, error=str(e))
 
-@client_router.delete('/client/{client_id}')
+@client_router.delete('/client/{client_id}', summary="Disable a client (soft delete)")
 async def delete_client(client_id):
     try:
         data = await service.delete_client(client_id)
@@ -55,5 +183,16 @@ async def delete_client(client_id):
     except Exception as e:
         return ResponseModel.build(success=False, error=str(e))
 
+@client_router.post('/client/{client_id}/restore', summary="Re-enable a disabled client")
+async def restore_client(client_id, response: Response):
+    try:
+        data = await service.restore_client(client_id)
+        response.headers["ETag"] = clientETag(data)
+        return ResponseModel.build(data=data)
+    except ValueError as ve:
+        return ResponseModel.build(success=False, error=str(ve))
+    except Exception as e:
+        return ResponseModel.build(success=False, error=str(e))
+
 
 
@@ -0,0 +1,22 @@
+from fastapi import APIRouter, status
+from fastapi.responses import JSONResponse
+from core import database
+from core.config import settings
+
+
+health_router = APIRouter()
+
+@health_router.get("/live")
+async def live():
+    return {"status": "ok"}
+
+@health_router.get("/ready")
+async def ready():
+    available = await database.ping(settings.HEALTH_CHECK_TIMEOUT_SECONDS)
+    return JSONResponse(
+        status_code=status.HTTP_200_OK if available else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={
+            "status": "ok" if available else "unavailable",
+            "mongodb": {"available": available, "pool": database.pool_stats()},
+        },
+    )
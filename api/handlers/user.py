@@ -1,11 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Body
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, status, Body, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from typing import List, Literal, Optional
 from beanie import PydanticObjectId
 from schemas.user_schema import UserCreate, UserUpdate, UserResponse
 from models.user import User
 from services.user_service import UserService
 from models.response_model import ResponseModel
 from api.dependencies.user_deps import get_current_user
+from core.streaming import EXPORT_MEDIA_TYPES
+from core.conditional import apply_validators, is_not_modified, make_etag, not_modified
 
 
 user_router = APIRouter(dependencies=[Depends(get_current_user)])
@@ -21,20 +24,49 @@ async def create_user(user: UserCreate):
         return ResponseModel.build(success=False, error="Erro interno ao criar usuário.")
 
 @user_router.get("/users", response_model=ResponseModel)
-async def get_all_users():
+async def get_all_users(request: Request, response: Response):
     try:
+        version, last_modified = await UserService.collection_version("users.list")
+        etag = make_etag("users", version)
+        if is_not_modified(request, etag, last_modified):
+            return not_modified(etag, last_modified)
         users = await UserService.get_all_users()
-        return ResponseModel.build(data=users)
+        return apply_validators(ResponseModel.build(data=users), response, etag, last_modified)
+    except Exception as e:
+        return ResponseModel.build(success=False, error=str(e))
+
+@user_router.get("/export")
+async def export_users(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    batch_size: Optional[int] = Query(None, ge=1),
+):
+    return StreamingResponse(
+        UserService.export_users(format, batch_size),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="users.{format}"'},
+    )
+
+@user_router.post("/batch", response_model=ResponseModel, summary="Fetch up to BATCH_MAX_IDS users by id")
+async def get_users_batch(ids: List[str] = Body(..., embed=True)):
+    try:
+        data = await UserService.get_users_batch(ids)
+        return ResponseModel.build(data=data)
+    except ValueError as ve:
+        return ResponseModel.build(success=False, error=str(ve))
     except Exception as e:
         return ResponseModel.build(success=False, error=str(e))
 
 @user_router.get("/user/{user_id}", response_model=ResponseModel)
-async def get_user_by_id(user_id: PydanticObjectId):
+async def get_user_by_id(user_id: PydanticObjectId, request: Request, response: Response):
     try:
-        user = await UserService.get_user_by_id(user_id)
+        version, last_modified = await UserService.collection_version()
+        etag = make_etag("user", user_id, version)
+        if is_not_modified(request, etag, last_modified):
+            return not_modified(etag, last_modified)
+        user = await UserService.get_user_response(user_id)
         if not user:
             return ResponseModel.build(success=False, error="User not found")
-        return ResponseModel.build(data=user)
+        return apply_validators(ResponseModel.build(data=user), response, etag, last_modified)
     except Exception as e:
         return ResponseModel.build(success=False, error=str(e))
 
@@ -1,17 +1,77 @@
-from fastapi import FastAPI
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from core.config import settings
-from beanie import init_beanie
-from motor.motor_asyncio import AsyncIOMotorClient
-from models import client, user
+from core import database
+from models import client, token, user
 from api.router import router
+from api.auth.jwt_auth import password_admission
+from core.compression import CompressionMiddleware
+from core.indexes import ensure_required_indexes, sync_indexes
+from core.routing import CAUSAL_TOKEN_HEADER, CausalSessionMiddleware, read_router
+from core.security import password_pool_stats, shutdown_password_executor
+from repositories.client_repository import ClientRepository, client_change_feed
+from repositories.user_repository import UserRepository
+from services.client_service import ClientService
+from core.metrics import MetricsMiddleware, render_metrics, stats_collector
+from services.token_service import revocation_store
+
+logger = logging.getLogger(__name__)
 
 client_app = [
     "http://localhost:3000",
 ]
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    document_models = [
+        client.Client,
+        user.User,
+        token.RevokedToken,
+    ]
+    await database.connect(document_models)
+    # índices únicos e TTL são a única proteção contra duplicatas; sem eles a aplicação não sobe
+    await ensure_required_indexes(document_models)
+
+    if settings.INDEX_SYNC_MODE == "blocking":
+        await sync_indexes(document_models)
+    elif settings.INDEX_SYNC_MODE == "background":
+        app.state.index_sync_task = asyncio.create_task(sync_indexes(document_models))
+
+    if settings.SEARCH_BACKFILL_ON_STARTUP:
+        app.state.search_backfill_task = asyncio.create_task(
+            ClientRepository.backfill_search_fields(settings.EXPORT_BATCH_SIZE)
+        )
+
+    try:
+        await revocation_store.sync()
+    except Exception as e:
+        logger.warning("Falha ao carregar tokens revogados: %s", e)
+    app.state.revocation_sync_task = asyncio.create_task(
+        revocation_store.run_sync_loop(settings.TOKEN_REVOCATION_SYNC_SECONDS)
+    )
+
+    if settings.CLIENT_ARCHIVE_INTERVAL_SECONDS > 0:
+        app.state.client_archive_task = asyncio.create_task(
+            ClientService().run_archive_loop(settings.CLIENT_ARCHIVE_INTERVAL_SECONDS)
+        )
+
+    try:
+        yield
+    finally:
+        for name in ("index_sync_task", "search_backfill_task", "revocation_sync_task", "client_archive_task"):
+            task = getattr(app.state, name, None)
+            if task is not None and not task.done():
+                task.cancel()
+        await client_change_feed.stop()
+        shutdown_password_executor()
+        database.close()
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -20,18 +80,35 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Last-Modified", CAUSAL_TOKEN_HEADER],
 )
 
-app.include_router(router)   
-
-@app.on_event("startup")
-async def startup_event():
-    database = AsyncIOMotorClient(settings.MONGODB_URL).serviceManagementSystem
-    
-    await init_beanie(
-        database=database,
-        document_models=[
-            client.Client,
-            user.User,
-        ]
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
     )
+
+if settings.READ_ROUTING_ENABLED:
+    app.add_middleware(CausalSessionMiddleware)
+
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+    stats_collector.register("password_hash", password_pool_stats)
+    stats_collector.register("client_cache", ClientRepository.cache_stats)
+    stats_collector.register("client_loader", ClientRepository.loader_stats)
+    stats_collector.register("client_change_feed", ClientRepository.change_feed_stats)
+    stats_collector.register("user_loader", UserRepository.loader_stats)
+    stats_collector.register("mongodb_pool", database.pool_stats)
+    stats_collector.register("read_routing", read_router.stats)
+    stats_collector.register("login_admission", password_admission.stats)
+    stats_collector.register("token_revocation", revocation_store.stats)
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        body, content_type = render_metrics()
+        return Response(content=body, media_type=content_type)
+
+app.include_router(router)
@@ -0,0 +1,80 @@
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks import common  # noqa: E402  (sets default env vars before the app is imported)
+
+
+async def run_route(client, name, method, url, requests, concurrency, **kwargs):
+    samples = []
+    queue = asyncio.Queue()
+    for _ in range(requests):
+        queue.put_nowait(None)
+
+    async def worker():
+        while not queue.empty():
+            queue.get_nowait()
+            start = time.perf_counter()
+            response = await client.request(method, url, **kwargs)
+            samples.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                raise RuntimeError(f"{name}: HTTP {response.status_code} {response.text[:200]}")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return common.summarize(samples, time.perf_counter() - start)
+
+
+async def main(args) -> int:
+    import httpx
+
+    await common.init_database(args.mongo_url)
+    scale = common.parse_scale(args.scale)
+    print(f"Populando {scale} clientes e {args.users} usuários...")
+    await common.seed_clients(scale)
+    await common.seed_users(args.users, password="benchmark")
+
+    from app import app
+
+    transport = httpx.ASGITransport(app=app)
+    results = {}
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        login = await client.post("/auth/login", data={"username": "usuario.0", "password": "benchmark"})
+        login.raise_for_status()
+        headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+        routes = [
+            ("POST /auth/login", "POST", "/auth/login", {"data": {"username": "usuario.0", "password": "benchmark"}}, args.login_requests),
+            ("get_current_user (/users/current_user)", "GET", "/users/current_user", {"headers": headers}, args.requests),
+            ("GET /clients/clients", "GET", "/clients/clients", {"headers": headers}, args.requests),
+            ("GET /clients/clients?fields=name,email", "GET", "/clients/clients", {"headers": headers, "params": {"fields": "name,email"}}, args.requests),
+            ("GET /clients/search?q=cliente1", "GET", "/clients/search", {"headers": headers, "params": {"q": "cliente1", "mode": "name"}}, args.requests),
+        ]
+        for name, method, url, kwargs, requests in routes:
+            if args.only and args.only not in name:
+                continue
+            results[name] = await run_route(client, name, method, url, requests, args.concurrency, **kwargs)
+
+    common.print_report(f"API ({scale} clientes, concorrência {args.concurrency})", results)
+    suite = f"api-{args.scale}"
+    if args.save_baseline:
+        common.save_baseline(suite, results, args.baseline)
+        return 0
+    return 0 if common.compare_with_baseline(suite, results, args.baseline, args.threshold) else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark das rotas principais da API")
+    parser.add_argument("--scale", default="1k", help="Quantidade de clientes: 1k, 100k, 1m ou um número")
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--login-requests", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--mongo-url", default=None, help="Usa um mongod real em vez do mongomock-motor")
+    parser.add_argument("--only", default=None, help="Executa apenas benchmarks cujo nome contenha este texto")
+    common.add_baseline_arguments(parser)
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,157 @@
+import json
+import os
+import resource
+import statistics
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+os.environ.setdefault("MONGODB_URI", "mongodb://localhost:27017")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret")
+os.environ.setdefault("JWT_REFRESH_SECRET_KEY", "benchmark-refresh-secret")
+os.environ.setdefault("INDEX_SYNC_MODE", "off")
+os.environ.setdefault("SEARCH_BACKFILL_ON_STARTUP", "False")
+os.environ.setdefault("SLOW_REQUEST_THRESHOLD_MS", "60000")
+# o harness repete o login com o mesmo usuário; o rate limit de login o abortaria com 429
+os.environ.setdefault("RATE_LIMIT_BACKEND", "none")
+
+SCALES = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+
+
+def parse_scale(value: str) -> int:
+    return SCALES.get(value.lower()) or int(value)
+
+
+async def init_database(mongo_url: Optional[str] = None, database_name: str = "serviceManagementBenchmark"):
+    from beanie import init_beanie
+    from models.client import Client
+    from models.user import User
+
+    if mongo_url:
+        from core.database import create_motor_client
+
+        motor_client = create_motor_client(mongo_url)
+        await motor_client.drop_database(database_name)
+    else:
+        try:
+            from mongomock_motor import AsyncMongoMockClient
+        except ImportError:
+            sys.exit("Instale mongomock-motor (benchmarks/requirements.txt) ou informe --mongo-url.")
+        motor_client = AsyncMongoMockClient()
+    database = motor_client[database_name]
+    await init_beanie(database=database, document_models=[Client, User])
+    return database
+
+
+async def seed_clients(count: int, chunk_size: int = 5_000) -> None:
+    from models.client import Client
+    from schemas.client_schema import clientSearchFields
+
+    collection = Client.get_motor_collection()
+    now = datetime.utcnow()
+    for start in range(0, count, chunk_size):
+        documents = []
+        for index in range(start, min(start + chunk_size, count)):
+            document = {
+                "name": f"Cliente {index}",
+                "email": f"cliente{index}@example.com",
+                "phone": f"+55 11 9{index:08d}",
+                "address": f"Rua {index}",
+                "city": f"Cidade {index % 50}",
+                "state": ("SP", "RJ", "MG", "PE", "RS")[index % 5],
+                "zip_code": f"{index % 100000:05d}-000",
+                "created_at": now,
+                "updated_at": None,
+                "disabled": index % 10 == 0,
+                "disabled_at": now if index % 10 == 0 else None,
+                "revision": 0,
+            }
+            document.update(clientSearchFields(document))
+            documents.append(document)
+        await collection.insert_many(documents, ordered=False)
+
+
+async def seed_users(count: int, password: str) -> List[str]:
+    from core.security import create_password
+    from models.user import User
+
+    hash_password = create_password(password)
+    documents = [
+        {
+            "name": f"Usuario {index}",
+            "username": f"usuario.{index}",
+            "email": f"usuario{index}@example.com",
+            "hash_password": hash_password,
+            "disabled": False,
+        }
+        for index in range(count)
+    ]
+    result = await User.get_motor_collection().insert_many(documents)
+    return [str(user_id) for user_id in result.inserted_ids]
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(samples: List[float], elapsed: float) -> Dict[str, float]:
+    return {
+        "count": len(samples),
+        "mean_ms": round(statistics.fmean(samples) * 1000, 3) if samples else 0.0,
+        "p50_ms": round(percentile(samples, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(samples, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(samples, 0.99) * 1000, 3),
+        "throughput_rps": round(len(samples) / elapsed, 2) if elapsed else 0.0,
+        "max_rss_mb": round(max_rss_mb(), 2),
+    }
+
+
+def max_rss_mb() -> float:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def print_report(title: str, results: Dict[str, Dict[str, float]]) -> None:
+    print(f"\n{title}")
+    columns = ("count", "p50_ms", "p95_ms", "p99_ms", "throughput_rps", "max_rss_mb")
+    print(f"{'benchmark':<52}" + "".join(f"{column:>16}" for column in columns))
+    for name, metrics in results.items():
+        print(f"{name:<52}" + "".join(f"{metrics.get(column, 0):>16}" for column in columns))
+
+
+def compare_with_baseline(suite: str, results: Dict[str, Dict[str, float]], path: Path, threshold: float) -> bool:
+    if not path.exists():
+        print(f"\nBaseline {path} não encontrada; nada a comparar.")
+        return True
+    baseline = json.loads(path.read_text()).get(suite, {})
+    ok = True
+    print(f"\nComparação com baseline ({path}, limite +{threshold:.0%} em p95):")
+    for name, metrics in results.items():
+        reference = baseline.get(name)
+        if not reference or not reference.get("p95_ms"):
+            print(f"  {name}: sem referência")
+            continue
+        change = metrics["p95_ms"] / reference["p95_ms"] - 1
+        regressed = change > threshold
+        ok = ok and not regressed
+        print(f"  {name}: p95 {reference['p95_ms']}ms -> {metrics['p95_ms']}ms ({change:+.1%}){' REGRESSÃO' if regressed else ''}")
+    return ok
+
+
+def save_baseline(suite: str, results: Dict[str, Dict[str, float]], path: Path) -> None:
+    data = json.loads(path.read_text()) if path.exists() else {}
+    data[suite] = results
+    path.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n")
+    print(f"\nBaseline salva em {path}")
+
+
+def add_baseline_arguments(parser) -> None:
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="Arquivo JSON de baseline")
+    parser.add_argument("--save-baseline", action="store_true", help="Grava os resultados como nova baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Regressão tolerada em p95 (0.2 = 20%%)")
@@ -0,0 +1,77 @@
+import argparse
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks import common  # noqa: E402  (sets default env vars before the app is imported)
+
+
+def measure(func, iterations: int, repeat: int):
+    samples = []
+    start = time.perf_counter()
+    for _ in range(repeat):
+        batch_start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        samples.append((time.perf_counter() - batch_start) / iterations)
+    elapsed = time.perf_counter() - start
+    summary = common.summarize(samples, elapsed)
+    summary["count"] = iterations * repeat
+    summary["throughput_rps"] = round(iterations * repeat / elapsed, 2)
+    return summary
+
+
+def benchmarks():
+    from bson import ObjectId
+    from core.security import create_access_token
+    from schemas.client_schema import clientEntity
+    from schemas.user_schema import UserRecord, UserResponse
+
+    client = SimpleNamespace(
+        id=ObjectId(),
+        name="Cliente Benchmark",
+        email="cliente@example.com",
+        phone="+55 11 912345678",
+        address="Rua Benchmark, 100",
+        created_at=datetime.utcnow(),
+        updated_at=None,
+        city="São Paulo",
+        state="SP",
+        zip_code="01000-000",
+        revision=0,
+    )
+    user = SimpleNamespace(id=ObjectId(), name="Usuario Benchmark", username="usuario.benchmark", email="usuario@example.com")
+    record = UserRecord(user.id, user.name, user.username, user.email)
+    user_id = str(user.id)
+    return {
+        "clientEntity": lambda: clientEntity(client),
+        "UserResponse.from_user": lambda: UserResponse.from_user(user),
+        "UserResponse.from_record": lambda: UserResponse.from_record(record),
+        "create_access_token": lambda: create_access_token(user_id),
+    }
+
+
+def main(args) -> int:
+    results = {}
+    for name, func in benchmarks().items():
+        if args.only and args.only not in name:
+            continue
+        results[name] = measure(func, args.iterations, args.repeat)
+    common.print_report("Micro-benchmarks (tempo por chamada)", results)
+    if args.save_baseline:
+        common.save_baseline("micro", results, args.baseline)
+        return 0
+    return 0 if common.compare_with_baseline("micro", results, args.baseline, args.threshold) else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Micro-benchmarks dos caminhos quentes")
+    parser.add_argument("--iterations", type=int, default=2_000)
+    parser.add_argument("--repeat", type=int, default=25)
+    parser.add_argument("--only", default=None)
+    common.add_baseline_arguments(parser)
+    sys.exit(main(parser.parse_args()))
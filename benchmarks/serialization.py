@@ -0,0 +1,85 @@
+import argparse
+import asyncio
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks import common  # noqa: E402  (sets default env vars before the app is imported)
+from benchmarks.micro import measure  # noqa: E402
+
+
+def build_documents(count: int):
+    from bson import ObjectId
+    from schemas.client_schema import clientSearchFields
+
+    now = datetime.utcnow()
+    documents = []
+    for index in range(count):
+        document = {
+            "_id": ObjectId(),
+            "name": f"Cliente {index}",
+            "email": f"cliente{index}@example.com",
+            "phone": f"+55 11 9{index:08d}",
+            "address": f"Rua {index}",
+            "city": "São Paulo",
+            "state": "SP",
+            "zip_code": "01000-000",
+            "created_at": now,
+            "updated_at": None,
+            "disabled": False,
+            "revision": 0,
+        }
+        document.update(clientSearchFields(document))
+        documents.append(document)
+    return documents
+
+
+def benchmarks(count: int):
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+    from core.responses import FastJSONResponse
+    from models.client import Client
+    from models.response_model import ResponseModel
+    from schemas.client_schema import clientDocumentEntity, list_clientEntity
+
+    documents = build_documents(count)
+
+    def current_path():
+        clients = [Client.model_validate(document) for document in documents]
+        envelope = ResponseModel.build(data={"items": list_clientEntity(clients), "next_cursor": None, "limit": count})
+        return JSONResponse(jsonable_encoder(envelope)).body
+
+    def fast_path():
+        items = [clientDocumentEntity(document) for document in documents]
+        return FastJSONResponse.build(data={"items": items, "next_cursor": None, "limit": count}).body
+
+    if json.loads(current_path()) != json.loads(fast_path()):
+        raise SystemExit("Os dois caminhos produziram respostas diferentes.")
+    return {
+        f"ResponseModel + jsonable_encoder ({count} docs)": current_path,
+        f"raw documents + FastJSONResponse ({count} docs)": fast_path,
+    }
+
+
+def main(args) -> int:
+    asyncio.run(common.init_database())
+    results = {}
+    for name, func in benchmarks(args.documents).items():
+        results[name] = measure(func, args.iterations, args.repeat)
+    common.print_report("Serialização da listagem de clientes (tempo por resposta)", results)
+    if args.save_baseline:
+        common.save_baseline("serialization", results, args.baseline)
+        return 0
+    return 0 if common.compare_with_baseline("serialization", results, args.baseline, args.threshold) else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compara o envelope padrão com o caminho rápido de serialização")
+    parser.add_argument("--documents", type=int, default=500)
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=10)
+    common.add_baseline_arguments(parser)
+    sys.exit(main(parser.parse_args()))
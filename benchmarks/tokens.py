@@ -0,0 +1,81 @@
+import argparse
+import importlib.util
+import sys
+import time
+from pathlib import Path
+from uuid import uuid4
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks import common  # noqa: E402  (sets default env vars before the app is imported)
+from benchmarks.micro import measure  # noqa: E402
+
+SECRET = "benchmark-secret-key-with-enough-entropy"
+
+
+def asymmetric_keys():
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+
+    def pem_pair(private_key):
+        private_pem = private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        ).decode()
+        public_pem = private_key.public_key().public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        ).decode()
+        return private_pem, public_pem
+
+    return {
+        "ES256": pem_pair(ec.generate_private_key(ec.SECP256R1())),
+        "EdDSA": pem_pair(ed25519.Ed25519PrivateKey.generate()),
+    }
+
+
+def backends():
+    from core.jwt_backends import create_jwt_backend
+
+    selected = {
+        "native HS256": create_jwt_backend("native", "HS256", secret=SECRET),
+        "pyjwt HS256": create_jwt_backend("pyjwt", "HS256", secret=SECRET),
+    }
+    if importlib.util.find_spec("jose") is not None:
+        selected["jose HS256"] = create_jwt_backend("jose", "HS256", secret=SECRET)
+    if importlib.util.find_spec("cryptography") is not None:
+        for algorithm, (private_pem, public_pem) in asymmetric_keys().items():
+            selected[f"pyjwt {algorithm}"] = create_jwt_backend(
+                "pyjwt", algorithm, private_key=private_pem, public_key=public_pem
+            )
+    else:
+        print("cryptography não instalado: ES256/EdDSA ignorados", file=sys.stderr)
+    return selected
+
+
+def main(args) -> int:
+    now = int(time.time())
+    claims = {"exp": now + 3600, "iat": now, "jti": uuid4().hex, "sub": "6650f1d2c9a1b2c3d4e5f607"}
+    results = {}
+    for name, backend in backends().items():
+        if args.only and args.only not in name:
+            continue
+        token = backend.encode(claims)
+        assert backend.decode(token)["sub"] == claims["sub"]
+        results[f"{name} encode"] = measure(lambda: backend.encode(claims), args.iterations, args.repeat)
+        results[f"{name} decode"] = measure(lambda: backend.decode(token), args.iterations, args.repeat)
+    common.print_report("Backends JWT (tokens/s em throughput_rps)", results)
+    if args.save_baseline:
+        common.save_baseline("tokens", results, args.baseline)
+        return 0
+    return 0 if common.compare_with_baseline("tokens", results, args.baseline, args.threshold) else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compara encode/decode de JWT entre backends")
+    parser.add_argument("--iterations", type=int, default=2_000)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--only", default=None)
+    common.add_baseline_arguments(parser)
+    sys.exit(main(parser.parse_args()))
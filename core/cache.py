@@ -0,0 +1,258 @@
+import asyncio
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+from core.tasks import spawn
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache:
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0 or self.maxsize <= 0:
+            return
+        self._data[key] = (value, time.monotonic() + ttl)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        return {"size": len(self._data), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
+
+
+class CacheBackend(ABC):
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        ...
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None:
+        ...
+
+    @abstractmethod
+    async def incr(self, key: str) -> int:
+        ...
+
+
+class NullCacheBackend(CacheBackend):
+    def __init__(self):
+        self._counters: dict = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return None
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        return None
+
+    async def delete(self, *keys: str) -> None:
+        return None
+
+    async def incr(self, key: str) -> int:
+        self._counters[key] = self._counters.get(key, 0) + 1
+        return self._counters[key]
+
+
+class MemoryCacheBackend(CacheBackend):
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._counters: dict = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        if key in self._counters:
+            return str(self._counters[key]).encode()
+        return self._cache.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        self._cache.set(key, value, ttl=ttl)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._cache.pop(key)
+            self._counters.pop(key, None)
+
+    async def incr(self, key: str) -> int:
+        self._counters[key] = self._counters.get(key, 0) + 1
+        return self._counters[key]
+
+
+class RedisCacheBackend(CacheBackend):
+    def __init__(self, client):
+        self._client = client
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisCacheBackend":
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise RuntimeError("O pacote 'redis' é necessário para usar o cache Redis.")
+        return cls(redis.from_url(url))
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._client.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await self._client.set(key, value, px=max(int(ttl * 1000), 1))
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self._client.delete(*keys)
+
+    async def incr(self, key: str) -> int:
+        return await self._client.incr(key)
+
+
+def create_cache_backend(kind: str, maxsize: int, ttl: float, redis_url: Optional[str] = None) -> CacheBackend:
+    if kind == "redis":
+        return RedisCacheBackend.from_url(redis_url)
+    if kind == "memory":
+        return MemoryCacheBackend(maxsize=maxsize, ttl=ttl)
+    return NullCacheBackend()
+
+
+class ReadThroughCache:
+    def __init__(
+        self,
+        backend: CacheBackend,
+        namespace: str,
+        ttl: float,
+        bypass: Optional[Callable[[], bool]] = None,
+    ):
+        self.backend = backend
+        self.namespace = namespace
+        self.ttl = ttl
+        self.bypass = bypass
+        self.bypassed = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.errors = 0
+        self._inflight: Dict[str, "asyncio.Future"] = {}
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    async def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        encode: Callable[[Any], bytes],
+        decode: Callable[[bytes], Any],
+        ttl: Optional[float] = None,
+    ) -> Any:
+        if self.bypass is not None and self.bypass():
+            self.bypassed += 1
+            return await loader()
+        full_key = self._key(key)
+        try:
+            cached = await self.backend.get(full_key)
+        except Exception as e:
+            self.errors += 1
+            logger.warning("Falha ao ler do cache %s: %s", full_key, e)
+            cached = None
+        if cached is not None:
+            self.hits += 1
+            return decode(cached)
+
+        pending = self._inflight.get(full_key)
+        if pending is not None:
+            self.coalesced += 1
+            raw = await asyncio.shield(pending)
+            return decode(raw) if raw is not None else None
+
+        self.misses += 1
+        # a carga é compartilhada entre requisições: roda fora do contexto (e da sessão) de quem a iniciou
+        pending = spawn(self._load(full_key, loader, encode, ttl))
+        self._inflight[full_key] = pending
+        try:
+            raw = await asyncio.shield(pending)
+        finally:
+            if pending.done():
+                self._inflight.pop(full_key, None)
+            else:
+                pending.add_done_callback(lambda _: self._inflight.pop(full_key, None))
+        return decode(raw) if raw is not None else None
+
+    async def _load(self, full_key: str, loader, encode, ttl) -> Optional[bytes]:
+        value = await loader()
+        if value is None:
+            return None
+        raw = encode(value)
+        try:
+            await self.backend.set(full_key, raw, ttl=self.ttl if ttl is None else ttl)
+        except Exception as e:
+            self.errors += 1
+            logger.warning("Falha ao gravar no cache %s: %s", full_key, e)
+        return raw
+
+    async def invalidate(self, *keys: str) -> None:
+        try:
+            await self.backend.delete(*(self._key(key) for key in keys))
+        except Exception as e:
+            self.errors += 1
+            logger.warning("Falha ao invalidar cache %s: %s", keys, e)
+
+    async def version(self, name: str = "version") -> int:
+        try:
+            raw = await self.backend.get(self._key(name))
+        except Exception as e:
+            self.errors += 1
+            logger.warning("Falha ao ler versão do cache %s: %s", self.namespace, e)
+            return -1
+        return int(raw) if raw is not None else 0
+
+    async def bump_version(self, name: str = "version") -> None:
+        try:
+            await self.backend.incr(self._key(name))
+        except Exception as e:
+            self.errors += 1
+            logger.warning("Falha ao atualizar versão do cache %s: %s", self.namespace, e)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "namespace": self.namespace,
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "bypassed": self.bypassed,
+            "errors": self.errors,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
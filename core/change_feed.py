@@ -0,0 +1,156 @@
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import AsyncIterator, Callable, List, Optional
+from core.responses import dumps
+from core.tasks import spawn
+
+logger = logging.getLogger(__name__)
+
+_DROPPED = object()
+
+
+def sse_frame(event: dict) -> bytes:
+    return b"id: %s\nevent: %s\ndata: %s\n\n" % (event["id"].encode(), event["op"].encode(), dumps(event))
+
+
+class Subscriber:
+    __slots__ = ("queue", "dropped")
+
+    def __init__(self, maxsize: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.dropped = False
+
+
+class ChangeFeed:
+    def __init__(
+        self,
+        collection_factory: Callable,
+        pipeline: Optional[List[dict]] = None,
+        queue_size: int = 256,
+        buffer_size: int = 1000,
+        retry_seconds: float = 5,
+    ):
+        self._collection_factory = collection_factory
+        self._pipeline = pipeline or []
+        self.queue_size = queue_size
+        self.retry_seconds = retry_seconds
+        self._buffer_size = buffer_size
+        self._buffer: "OrderedDict[str, dict]" = OrderedDict()
+        self._subscribers = set()
+        self._resume_token = None
+        self._task: Optional[asyncio.Task] = None
+        self.published = 0
+        self.dropped = 0
+        self.errors = 0
+        self.resets = 0
+
+    @staticmethod
+    def to_event(change: dict) -> dict:
+        event = {
+            "id": change["_id"]["_data"],
+            "op": change["operationType"],
+            "client_id": str(change.get("documentKey", {}).get("_id")),
+        }
+        if "fullDocument" in change and change["fullDocument"] is not None:
+            event["fields"] = {key: value for key, value in change["fullDocument"].items() if key != "_id"}
+        description = change.get("updateDescription")
+        if description:
+            event["fields"] = description.get("updatedFields", {})
+            event["removed"] = description.get("removedFields", [])
+        return event
+
+    def ensure_started(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = spawn(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                async with self._collection_factory().watch(self._pipeline, resume_after=self._resume_token) as stream:
+                    async for change in stream:
+                        self._resume_token = change["_id"]
+                        self.publish(self.to_event(change))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.errors += 1
+                logger.warning("Change stream interrompido, tentando novamente em %ss: %s", self.retry_seconds, e)
+                await asyncio.sleep(self.retry_seconds)
+
+    def publish(self, event: dict) -> None:
+        self.published += 1
+        self._buffer[event["id"]] = event
+        while len(self._buffer) > self._buffer_size:
+            self._buffer.popitem(last=False)
+        for subscriber in list(self._subscribers):
+            try:
+                subscriber.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                self._drop(subscriber)
+
+    def _drop(self, subscriber: Subscriber) -> None:
+        self.dropped += 1
+        subscriber.dropped = True
+        self._subscribers.discard(subscriber)
+        while not subscriber.queue.empty():
+            subscriber.queue.get_nowait()
+        subscriber.queue.put_nowait(_DROPPED)
+
+    def subscribe(self, last_event_id: Optional[str] = None):
+        # (None, None) quando last_event_id já saiu do buffer: o cliente precisa recomeçar
+        replay = []
+        if last_event_id:
+            if last_event_id not in self._buffer:
+                return None, None
+            ids = list(self._buffer)
+            replay = [self._buffer[event_id] for event_id in ids[ids.index(last_event_id) + 1:]]
+        subscriber = Subscriber(self.queue_size)
+        self._subscribers.add(subscriber)
+        self.ensure_started()
+        return subscriber, replay
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        self._subscribers.discard(subscriber)
+
+    async def stream(self, last_event_id: Optional[str], heartbeat: float) -> AsyncIterator[bytes]:
+        subscriber, replay = self.subscribe(last_event_id)
+        if subscriber is None:
+            # eventos perdidos: o cliente recarrega o estado e segue no feed compartilhado
+            self.resets += 1
+            yield b"event: reset\ndata: {}\n\n"
+            subscriber, replay = self.subscribe()
+        try:
+            for event in replay:
+                yield sse_frame(event)
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscriber.queue.get(), timeout=heartbeat)
+                except asyncio.TimeoutError:
+                    yield b": keep-alive\n\n"
+                    continue
+                if event is _DROPPED:
+                    yield b"event: dropped\ndata: {}\n\n"
+                    return
+                yield sse_frame(event)
+        finally:
+            self.unsubscribe(subscriber)
+
+    def stats(self) -> dict:
+        return {
+            "subscribers": len(self._subscribers),
+            "published": self.published,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "resets": self.resets,
+            "buffered": len(self._buffer),
+        }
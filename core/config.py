@@ -14,10 +14,103 @@ class Settings(BaseSettings):
     ]
     # database settings
     MONGODB_URL: str = config("MONGODB_URI", cast=str)
+    MONGODB_DATABASE: str = config("MONGODB_DATABASE", default="serviceManagementSystem", cast=str)
+    MONGODB_MAX_POOL_SIZE: int = config("MONGODB_MAX_POOL_SIZE", default=100, cast=int)
+    MONGODB_MIN_POOL_SIZE: int = config("MONGODB_MIN_POOL_SIZE", default=10, cast=int)
+    MONGODB_MAX_IDLE_TIME_MS: int = config("MONGODB_MAX_IDLE_TIME_MS", default=300000, cast=int)  # 0 = sem limite
+    MONGODB_WAIT_QUEUE_TIMEOUT_MS: int = config("MONGODB_WAIT_QUEUE_TIMEOUT_MS", default=0, cast=int)  # 0 = sem limite
+    MONGODB_SERVER_SELECTION_TIMEOUT_MS: int = config("MONGODB_SERVER_SELECTION_TIMEOUT_MS", default=5000, cast=int)
+    MONGODB_COMPRESSORS: str = config("MONGODB_COMPRESSORS", default="zstd,snappy,zlib", cast=str)
+    MONGODB_READ_PREFERENCE: str = config("MONGODB_READ_PREFERENCE", default="primary", cast=str)
+    MONGODB_MAX_STALENESS_SECONDS: int = config("MONGODB_MAX_STALENESS_SECONDS", default=90, cast=int)  # 0 = sem limite; mínimo 90
+    MONGODB_POOL_WARMUP_CONNECTIONS: int = config("MONGODB_POOL_WARMUP_CONNECTIONS", default=10, cast=int)
+    HEALTH_CHECK_TIMEOUT_SECONDS: float = config("HEALTH_CHECK_TIMEOUT_SECONDS", default=2.0, cast=float)
+    # read routing settings
+    READ_ROUTING_ENABLED: bool = config("READ_ROUTING_ENABLED", default=False, cast=bool)  # exige replica set
+    READ_ROUTING_POLICY: str = config(
+        "READ_ROUTING_POLICY",
+        default=(
+            "clients.list=secondaryPreferred,clients.search=secondaryPreferred,"
+            "clients.export=secondaryPreferred,clients.stats=secondaryPreferred,"
+            "users.list=secondaryPreferred,users.export=secondaryPreferred"
+        ),
+        cast=str,
+    )  # rota=modo; rotas ausentes leem do primary
+    # server settings
+    SERVER_HOST: str = config("SERVER_HOST", default="0.0.0.0", cast=str)
+    SERVER_PORT: int = config("SERVER_PORT", default=8000, cast=int)
+    SERVER_WORKERS: int = config("SERVER_WORKERS", default=0, cast=int)  # 0 = um por núcleo de CPU com backends compartilhados, senão 1
+    SERVER_BACKLOG: int = config("SERVER_BACKLOG", default=2048, cast=int)
+    SERVER_KEEPALIVE_SECONDS: int = config("SERVER_KEEPALIVE_SECONDS", default=5, cast=int)
+    SERVER_GRACEFUL_SHUTDOWN_SECONDS: int = config("SERVER_GRACEFUL_SHUTDOWN_SECONDS", default=30, cast=int)
+    SERVER_ACCESS_LOG: bool = config("SERVER_ACCESS_LOG", default=False, cast=bool)
+    # observability settings
+    METRICS_ENABLED: bool = config("METRICS_ENABLED", default=True, cast=bool)
+    SLOW_REQUEST_THRESHOLD_MS: int = config("SLOW_REQUEST_THRESHOLD_MS", default=500, cast=int)
+    INDEX_SYNC_MODE: str = config("INDEX_SYNC_MODE", default="background", cast=str)  # background | blocking | off; únicos e TTL sempre bloqueantes
     ACCESS_TOKEN_EXPIRE_MINUTES : int = 480    
     SECRET_KEY: str = config("JWT_SECRET_KEY", cast=str)
     ACCESS_REFRESH_TOKEN_SECRET_KEY: int = 120    
     REFRESH_SECRET_KEY: str = config("JWT_REFRESH_SECRET_KEY", cast=str)
-    ALGORITHM: str = "HS256"
+    ALGORITHM: str = config("JWT_ALGORITHM", default="HS256", cast=str)  # HS256 | HS384 | HS512 | ES256 | EdDSA | RS256
+    JWT_BACKEND: str = config("JWT_BACKEND", default="auto", cast=str)  # auto | native | pyjwt | jose
+    JWT_PRIVATE_KEY_FILE: str = config("JWT_PRIVATE_KEY_FILE", default="", cast=str)
+    JWT_PUBLIC_KEY_FILE: str = config("JWT_PUBLIC_KEY_FILE", default="", cast=str)
+    JWT_KEY_ID: str = config("JWT_KEY_ID", default="", cast=str)
+    # auth cache settings
+    TOKEN_CACHE_SIZE: int = config("TOKEN_CACHE_SIZE", default=10000, cast=int)
+    TOKEN_CACHE_TTL_SECONDS: int = config("TOKEN_CACHE_TTL_SECONDS", default=300, cast=int)
+    USER_CACHE_SIZE: int = config("USER_CACHE_SIZE", default=10000, cast=int)
+    USER_CACHE_TTL_SECONDS: int = config("USER_CACHE_TTL_SECONDS", default=60, cast=int)
+    TOKEN_REVOCATION_SYNC_SECONDS: float = config("TOKEN_REVOCATION_SYNC_SECONDS", default=5, cast=float)
+    # client cache settings
+    CLIENT_CACHE_BACKEND: str = config("CLIENT_CACHE_BACKEND", default="memory", cast=str)  # memory | redis | none
+    CLIENT_CACHE_SIZE: int = config("CLIENT_CACHE_SIZE", default=10000, cast=int)
+    CLIENT_CACHE_TTL_SECONDS: int = config("CLIENT_CACHE_TTL_SECONDS", default=60, cast=int)
+    CLIENT_CACHE_LIST_TTL_SECONDS: int = config("CLIENT_CACHE_LIST_TTL_SECONDS", default=15, cast=int)
+    CLIENT_STATS_TTL_SECONDS: int = config("CLIENT_STATS_TTL_SECONDS", default=30, cast=int)
+    CLIENT_STATS_DAYS: int = config("CLIENT_STATS_DAYS", default=30, cast=int)
+    CACHE_REDIS_URL: str = config("CACHE_REDIS_URL", default="redis://localhost:6379/0", cast=str)
+    # client archive settings
+    CLIENT_ARCHIVE_AFTER_DAYS: int = config("CLIENT_ARCHIVE_AFTER_DAYS", default=90, cast=int)
+    CLIENT_ARCHIVE_INTERVAL_SECONDS: int = config("CLIENT_ARCHIVE_INTERVAL_SECONDS", default=3600, cast=int)  # 0 = desligado
+    CLIENT_ARCHIVE_BATCH_SIZE: int = config("CLIENT_ARCHIVE_BATCH_SIZE", default=500, cast=int)
+    # login rate limit settings
+    RATE_LIMIT_BACKEND: str = config("RATE_LIMIT_BACKEND", default="memory", cast=str)  # memory | redis | none
+    RATE_LIMIT_REDIS_URL: str = config("RATE_LIMIT_REDIS_URL", default="redis://localhost:6379/0", cast=str)
+    RATE_LIMIT_MAX_KEYS: int = config("RATE_LIMIT_MAX_KEYS", default=100000, cast=int)
+    LOGIN_RATE_LIMIT_IP_BURST: int = config("LOGIN_RATE_LIMIT_IP_BURST", default=20, cast=int)
+    LOGIN_RATE_LIMIT_IP_PER_MINUTE: float = config("LOGIN_RATE_LIMIT_IP_PER_MINUTE", default=10, cast=float)
+    LOGIN_RATE_LIMIT_USERNAME_BURST: int = config("LOGIN_RATE_LIMIT_USERNAME_BURST", default=5, cast=int)
+    LOGIN_RATE_LIMIT_USERNAME_PER_MINUTE: float = config("LOGIN_RATE_LIMIT_USERNAME_PER_MINUTE", default=5, cast=float)
+    LOGIN_MAX_CONCURRENT_VERIFICATIONS: int = config("LOGIN_MAX_CONCURRENT_VERIFICATIONS", default=16, cast=int)  # por worker: protege o executor de senhas do próprio processo
+    LOGIN_SHED_RETRY_AFTER_SECONDS: int = config("LOGIN_SHED_RETRY_AFTER_SECONDS", default=1, cast=int)
+    # password hashing settings
+    BCRYPT_ROUNDS: int = config("BCRYPT_ROUNDS", default=12, cast=int)
+    PASSWORD_HASH_EXECUTOR: str = config("PASSWORD_HASH_EXECUTOR", default="thread", cast=str)  # thread | process
+    PASSWORD_HASH_WORKERS: int = config("PASSWORD_HASH_WORKERS", default=4, cast=int)
+    PASSWORD_HASH_MAX_CONCURRENCY: int = config("PASSWORD_HASH_MAX_CONCURRENCY", default=8, cast=int)
+    # response settings
+    FAST_JSON_RESPONSES: bool = config("FAST_JSON_RESPONSES", default=False, cast=bool)
+    COMPRESSION_ENABLED: bool = config("COMPRESSION_ENABLED", default=True, cast=bool)
+    COMPRESSION_MINIMUM_SIZE: int = config("COMPRESSION_MINIMUM_SIZE", default=1024, cast=int)
+    COMPRESSION_GZIP_LEVEL: int = config("COMPRESSION_GZIP_LEVEL", default=6, cast=int)
+    COMPRESSION_BROTLI_QUALITY: int = config("COMPRESSION_BROTLI_QUALITY", default=4, cast=int)
+    # pagination settings
+    CLIENTS_PAGE_SIZE: int = config("CLIENTS_PAGE_SIZE", default=50, cast=int)
+    CLIENTS_MAX_PAGE_SIZE: int = config("CLIENTS_MAX_PAGE_SIZE", default=500, cast=int)
+    SEARCH_BACKFILL_ON_STARTUP: bool = config("SEARCH_BACKFILL_ON_STARTUP", default=False, cast=bool)  # prefira python server.py --backfill-search
+    SEARCH_MAX_OFFSET: int = config("SEARCH_MAX_OFFSET", default=5000, cast=int)
+    BATCH_MAX_IDS: int = config("BATCH_MAX_IDS", default=500, cast=int)
+    # change feed settings
+    CHANGE_FEED_QUEUE_SIZE: int = config("CHANGE_FEED_QUEUE_SIZE", default=256, cast=int)
+    CHANGE_FEED_BUFFER_SIZE: int = config("CHANGE_FEED_BUFFER_SIZE", default=1000, cast=int)
+    CHANGE_FEED_HEARTBEAT_SECONDS: float = config("CHANGE_FEED_HEARTBEAT_SECONDS", default=15, cast=float)
+    # export settings
+    EXPORT_BATCH_SIZE: int = config("EXPORT_BATCH_SIZE", default=1000, cast=int)
+    EXPORT_MAX_BATCH_SIZE: int = config("EXPORT_MAX_BATCH_SIZE", default=10000, cast=int)
+    # bulk import settings
+    IMPORT_CHUNK_SIZE: int = config("IMPORT_CHUNK_SIZE", default=1000, cast=int)
+    IMPORT_MAX_ROWS: int = config("IMPORT_MAX_ROWS", default=100000, cast=int)
     
 settings = Settings()
\ No newline at end of file
@@ -0,0 +1,174 @@
+import asyncio
+import importlib.util
+import logging
+import threading
+from typing import List, Optional, Sequence, Type
+from beanie import Document, init_beanie
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo import monitoring
+from core.config import settings
+from core.metrics import mongo_command_listener
+
+logger = logging.getLogger(__name__)
+
+_COMPRESSOR_MODULES = {"zstd": "zstandard", "snappy": "snappy", "zlib": "zlib"}
+
+
+class PoolStatsListener(monitoring.ConnectionPoolListener):
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {
+            "created": 0,
+            "closed": 0,
+            "checkouts": 0,
+            "checkins": 0,
+            "checkout_started": 0,
+            "checkout_failures": 0,
+            "pool_clears": 0,
+        }
+
+    def _incr(self, key: str) -> None:
+        with self._lock:
+            self._stats[key] += 1
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self._incr("pool_clears")
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self._incr("created")
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._incr("closed")
+
+    def connection_check_out_started(self, event):
+        self._incr("checkout_started")
+
+    def connection_check_out_failed(self, event):
+        self._incr("checkout_failures")
+
+    def connection_checked_out(self, event):
+        self._incr("checkouts")
+
+    def connection_checked_in(self, event):
+        self._incr("checkins")
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+        return {
+            "open": stats["created"] - stats["closed"],
+            "in_use": stats["checkouts"] - stats["checkins"],
+            "waiting": stats["checkout_started"] - stats["checkouts"] - stats["checkout_failures"],
+            "created": stats["created"],
+            "closed": stats["closed"],
+            "checkout_failures": stats["checkout_failures"],
+            "pool_clears": stats["pool_clears"],
+            "max_pool_size": settings.MONGODB_MAX_POOL_SIZE,
+            "min_pool_size": settings.MONGODB_MIN_POOL_SIZE,
+        }
+
+
+pool_stats_listener = PoolStatsListener()
+
+_client: Optional[AsyncIOMotorClient] = None
+
+
+def available_compressors(names: str) -> List[str]:
+    compressors = []
+    for name in (value.strip() for value in names.split(",")):
+        module = _COMPRESSOR_MODULES.get(name)
+        if module is None:
+            if name:
+                logger.warning("Compressor desconhecido ignorado: %s", name)
+            continue
+        if importlib.util.find_spec(module) is None:
+            logger.info("Compressor %s indisponível (pacote %s não instalado)", name, module)
+            continue
+        compressors.append(name)
+    return compressors
+
+
+def create_motor_client(url: Optional[str] = None) -> AsyncIOMotorClient:
+    options = {
+        "maxPoolSize": settings.MONGODB_MAX_POOL_SIZE,
+        "minPoolSize": settings.MONGODB_MIN_POOL_SIZE,
+        "maxIdleTimeMS": settings.MONGODB_MAX_IDLE_TIME_MS or None,
+        "serverSelectionTimeoutMS": settings.MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+        "readPreference": settings.MONGODB_READ_PREFERENCE,
+        "event_listeners": [mongo_command_listener, pool_stats_listener],
+    }
+    if settings.MONGODB_WAIT_QUEUE_TIMEOUT_MS:
+        options["waitQueueTimeoutMS"] = settings.MONGODB_WAIT_QUEUE_TIMEOUT_MS
+    compressors = available_compressors(settings.MONGODB_COMPRESSORS)
+    if compressors:
+        options["compressors"] = compressors
+    return AsyncIOMotorClient(url or settings.MONGODB_URL, **options)
+
+
+def get_client() -> AsyncIOMotorClient:
+    if _client is None:
+        raise RuntimeError("Cliente MongoDB não inicializado.")
+    return _client
+
+
+def get_database() -> AsyncIOMotorDatabase:
+    return get_client()[settings.MONGODB_DATABASE]
+
+
+async def warm_up_pool(client: AsyncIOMotorClient, connections: int) -> int:
+    if connections <= 0:
+        return 0
+    results = await asyncio.gather(
+        *(client.admin.command("ping") for _ in range(connections)),
+        return_exceptions=True,
+    )
+    failures = [result for result in results if isinstance(result, Exception)]
+    if failures:
+        logger.warning("Aquecimento do pool MongoDB: %s de %s pings falharam: %s", len(failures), connections, failures[0])
+    return connections - len(failures)
+
+
+async def connect(document_models: Sequence[Type[Document]], client: Optional[AsyncIOMotorClient] = None) -> AsyncIOMotorDatabase:
+    global _client
+    _client = client or create_motor_client()
+    database = get_database()
+    await init_beanie(
+        database=database,
+        document_models=list(document_models),
+        skip_indexes=True,
+    )
+    warmed = await warm_up_pool(_client, settings.MONGODB_POOL_WARMUP_CONNECTIONS)
+    logger.info("Pool MongoDB aquecido com %s conexões", warmed)
+    return database
+
+
+def close() -> None:
+    global _client
+    if _client is not None:
+        _client.close()
+        _client = None
+
+
+async def ping(timeout: float) -> bool:
+    try:
+        await asyncio.wait_for(get_client().admin.command("ping"), timeout=timeout)
+        return True
+    except Exception as e:
+        logger.warning("MongoDB indisponível: %s", e)
+        return False
+
+
+def pool_stats() -> dict:
+    return pool_stats_listener.stats()
@@ -0,0 +1,2 @@
+class PreconditionFailedError(ValueError):
+    pass
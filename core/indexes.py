@@ -0,0 +1,56 @@
+import logging
+from typing import List, Sequence, Type
+from beanie import Document
+from pymongo import IndexModel
+from pymongo.errors import OperationFailure
+
+logger = logging.getLogger(__name__)
+
+REQUIRED_INDEX_OPTIONS = ("unique", "expireAfterSeconds", "partialFilterExpression")
+
+
+def document_indexes(model: Type[Document]) -> List[IndexModel]:
+    return [index.index for index in model.get_settings().indexes or []]
+
+
+def is_required(index: IndexModel) -> bool:
+    # unicidade e TTL garantem corretude, não só desempenho
+    return bool(index.document.get("unique")) or "expireAfterSeconds" in index.document
+
+
+async def ensure_required_indexes(document_models: Sequence[Type[Document]]) -> None:
+    for model in document_models:
+        collection = model.get_motor_collection()
+        for index in filter(is_required, document_indexes(model)):
+            try:
+                await collection.create_indexes([index])
+            except OperationFailure as e:
+                raise RuntimeError(
+                    f"Não foi possível criar o índice obrigatório {index.document['name']} em {collection.name}: {e}"
+                ) from e
+        await verify_required_indexes(model)
+        logger.info("Índices obrigatórios garantidos para %s", collection.name)
+
+
+async def verify_required_indexes(model: Type[Document]) -> None:
+    # create_indexes aceita um índice homônimo já existente; confere se ele é mesmo único/TTL
+    collection = model.get_motor_collection()
+    existing = await collection.index_information()
+    for index in filter(is_required, document_indexes(model)):
+        name = index.document["name"]
+        info = existing.get(name)
+        options = [option for option in REQUIRED_INDEX_OPTIONS if option in index.document]
+        if info is None or any(info.get(option) != index.document[option] for option in options):
+            raise RuntimeError(f"Índice obrigatório {name} ausente ou sem as opções esperadas em {collection.name}.")
+
+
+async def sync_indexes(document_models: Sequence[Type[Document]]) -> None:
+    for model in document_models:
+        indexes = [index for index in document_indexes(model) if not is_required(index)]
+        collection = model.get_motor_collection()
+        for index in indexes:
+            try:
+                await collection.create_indexes([index])
+            except OperationFailure as e:
+                logger.error("Falha ao criar índice %s em %s: %s", index.document["name"], collection.name, e)
+        logger.info("Índices sincronizados para %s", collection.name)
@@ -0,0 +1,187 @@
+import base64
+import hashlib
+import hmac
+import json
+import time
+from abc import ABC, abstractmethod
+from typing import Optional
+
+HMAC_ALGORITHMS = {"HS256": hashlib.sha256, "HS384": hashlib.sha384, "HS512": hashlib.sha512}
+
+
+class InvalidTokenError(ValueError):
+    pass
+
+
+def _b64encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def _b64decode(data: bytes) -> bytes:
+    return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+
+
+def _json_segment(value: dict) -> bytes:
+    return _b64encode(json.dumps(value, separators=(",", ":")).encode())
+
+
+def _header(algorithm: str, key_id: Optional[str]) -> dict:
+    header = {"alg": algorithm, "typ": "JWT"}
+    if key_id:
+        header["kid"] = key_id
+    return header
+
+
+class JWTBackend(ABC):
+    algorithm: str
+
+    @abstractmethod
+    def encode(self, claims: dict) -> str:
+        ...
+
+    @abstractmethod
+    def decode(self, token: str) -> dict:
+        ...
+
+    def jwks(self) -> list:
+        return []
+
+
+class HMACBackend(JWTBackend):
+    def __init__(self, secret: str, algorithm: str = "HS256", key_id: Optional[str] = None, leeway: int = 0):
+        if algorithm not in HMAC_ALGORITHMS:
+            raise ValueError(f"Algoritmo HMAC não suportado: {algorithm}")
+        self.algorithm = algorithm
+        self.leeway = leeway
+        self._mac = hmac.new(secret.encode(), digestmod=HMAC_ALGORITHMS[algorithm])
+        self._header_segment = _json_segment(_header(algorithm, key_id))
+
+    def _sign(self, signing_input: bytes) -> bytes:
+        mac = self._mac.copy()
+        mac.update(signing_input)
+        return mac.digest()
+
+    def encode(self, claims: dict) -> str:
+        signing_input = self._header_segment + b"." + _json_segment(claims)
+        return (signing_input + b"." + _b64encode(self._sign(signing_input))).decode()
+
+    def decode(self, token: str) -> dict:
+        try:
+            signing_input, _, signature = token.encode().rpartition(b".")
+            header_segment, _, payload_segment = signing_input.partition(b".")
+            if header_segment != self._header_segment:
+                header = json.loads(_b64decode(header_segment))
+                if header.get("alg") != self.algorithm:
+                    raise InvalidTokenError("Algoritmo do token inválido.")
+            if not hmac.compare_digest(self._sign(signing_input), _b64decode(signature)):
+                raise InvalidTokenError("Assinatura do token inválida.")
+            claims = json.loads(_b64decode(payload_segment))
+        except InvalidTokenError:
+            raise
+        except Exception:
+            raise InvalidTokenError("Token malformado.")
+        if not isinstance(claims, dict):
+            raise InvalidTokenError("Token malformado.")
+        exp = claims.get("exp")
+        if exp is not None and exp + self.leeway < time.time():
+            raise InvalidTokenError("Token expirado.")
+        return claims
+
+
+class PyJWTBackend(JWTBackend):
+    def __init__(
+        self,
+        algorithm: str,
+        signing_key=None,
+        verification_key=None,
+        key_id: Optional[str] = None,
+        leeway: int = 0,
+    ):
+        import jwt
+
+        self._jwt = jwt
+        self.algorithm = algorithm
+        self.leeway = leeway
+        try:
+            self._algorithm = jwt.get_algorithm_by_name(algorithm)
+        except NotImplementedError:
+            # RS*/ES*/PS*/EdDSA só são registrados pelo PyJWT quando o cryptography está instalado
+            if algorithm in jwt.algorithms.requires_cryptography:
+                raise RuntimeError(f"O pacote 'cryptography' é necessário para usar o algoritmo JWT {algorithm}.")
+            raise ValueError(f"Algoritmo JWT não suportado: {algorithm}")
+        self._signing_key = self._algorithm.prepare_key(signing_key) if signing_key is not None else None
+        verification_key = self._algorithm.prepare_key(verification_key or signing_key)
+        if hasattr(verification_key, "public_key"):
+            verification_key = verification_key.public_key()
+        self._verification_key = verification_key
+        self._headers = {"kid": key_id} if key_id else None
+        self._key_id = key_id
+
+    def encode(self, claims: dict) -> str:
+        if self._signing_key is None:
+            raise RuntimeError("Chave privada JWT não configurada; este serviço só verifica tokens.")
+        return self._jwt.encode(claims, self._signing_key, algorithm=self.algorithm, headers=self._headers)
+
+    def decode(self, token: str) -> dict:
+        try:
+            return self._jwt.decode(token, self._verification_key, algorithms=[self.algorithm], leeway=self.leeway)
+        except self._jwt.PyJWTError as e:
+            raise InvalidTokenError(str(e))
+
+    def jwks(self) -> list:
+        if self.algorithm in HMAC_ALGORITHMS:
+            return []
+        jwk = self._algorithm.to_jwk(self._verification_key, as_dict=True)
+        jwk.update({"alg": self.algorithm, "use": "sig"})
+        if self._key_id:
+            jwk["kid"] = self._key_id
+        return [jwk]
+
+
+class JoseBackend(JWTBackend):
+    def __init__(self, secret: str, algorithm: str = "HS256", key_id: Optional[str] = None):
+        from jose import jwt
+
+        self._jwt = jwt
+        self.algorithm = algorithm
+        self._secret = secret
+        self._headers = {"kid": key_id} if key_id else None
+
+    def encode(self, claims: dict) -> str:
+        return self._jwt.encode(claims, self._secret, algorithm=self.algorithm, headers=self._headers)
+
+    def decode(self, token: str) -> dict:
+        from jose import JWTError
+
+        try:
+            return self._jwt.decode(token, self._secret, algorithms=[self.algorithm])
+        except JWTError as e:
+            raise InvalidTokenError(str(e))
+
+
+def create_jwt_backend(
+    kind: str,
+    algorithm: str,
+    secret: Optional[str] = None,
+    private_key: Optional[str] = None,
+    public_key: Optional[str] = None,
+    key_id: Optional[str] = None,
+) -> JWTBackend:
+    symmetric = algorithm in HMAC_ALGORITHMS
+    if kind == "auto":
+        kind = "native" if symmetric else "pyjwt"
+    if kind == "native":
+        if not symmetric:
+            raise ValueError(f"O backend nativo só suporta HMAC, não {algorithm}.")
+        return HMACBackend(secret, algorithm, key_id=key_id)
+    if kind == "pyjwt":
+        if symmetric:
+            return PyJWTBackend(algorithm, signing_key=secret, key_id=key_id)
+        if private_key is None and public_key is None:
+            raise ValueError(f"{algorithm} exige JWT_PRIVATE_KEY_FILE e/ou JWT_PUBLIC_KEY_FILE.")
+        return PyJWTBackend(algorithm, signing_key=private_key, verification_key=public_key, key_id=key_id)
+    if kind == "jose":
+        if not symmetric:
+            raise ValueError("Use JWT_BACKEND=pyjwt para algoritmos assimétricos.")
+        return JoseBackend(secret, algorithm, key_id=key_id)
+    raise ValueError(f"Backend JWT desconhecido: {kind}")
@@ -0,0 +1,62 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, List
+from bson import ObjectId
+from core.tasks import spawn
+
+
+class BatchLoader:
+    def __init__(self, batch_fn: Callable[[List[Hashable]], Awaitable[Dict[Hashable, Any]]], max_batch_size: int = 1000):
+        self._batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self._pending: Dict[Hashable, asyncio.Future] = {}
+        self._scheduled = False
+        self.loads = 0
+        self.coalesced = 0
+        self.batches = 0
+
+    async def load(self, key: Hashable) -> Any:
+        self.loads += 1
+        future = self._pending.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._pending[key] = future
+            if not self._scheduled:
+                self._scheduled = True
+                loop.call_soon(self._dispatch)
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(future)
+
+    def _dispatch(self) -> None:
+        pending, self._pending = self._pending, {}
+        self._scheduled = False
+        items = list(pending.items())
+        for start in range(0, len(items), self.max_batch_size):
+            spawn(self._run(dict(items[start:start + self.max_batch_size])))
+
+    async def _run(self, futures: Dict[Hashable, asyncio.Future]) -> None:
+        self.batches += 1
+        try:
+            results = await self._batch_fn(list(futures))
+        except Exception as e:
+            for future in futures.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for key, future in futures.items():
+            if not future.done():
+                future.set_result(results.get(key))
+
+    def stats(self) -> dict:
+        return {"loads": self.loads, "coalesced": self.coalesced, "batches": self.batches}
+
+
+def unique_object_ids(ids: List[str], max_ids: int) -> List[ObjectId]:
+    unique_ids = list(dict.fromkeys(ids))
+    if len(unique_ids) > max_ids:
+        raise ValueError(f"Informe no máximo {max_ids} IDs por requisição.")
+    invalid = [value for value in unique_ids if not ObjectId.is_valid(value)]
+    if invalid:
+        raise ValueError(f"IDs inválidos: {', '.join(invalid)}")
+    return [ObjectId(value) for value in unique_ids]
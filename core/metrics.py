@@ -0,0 +1,225 @@
+import functools
+import inspect
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Counter as PromCounter, Histogram, generate_latest
+from pymongo import monitoring
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency",
+    ["method", "route", "status"],
+)
+REQUEST_SIZE = Histogram(
+    "http_request_size_bytes",
+    "HTTP request body size",
+    ["method", "route"],
+    buckets=(100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000),
+)
+RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes",
+    "HTTP response body size",
+    ["method", "route"],
+    buckets=(100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000),
+)
+REQUEST_DB_COMMANDS = Histogram(
+    "http_request_db_commands",
+    "MongoDB commands issued per HTTP request",
+    ["method", "route"],
+    buckets=(0, 1, 2, 3, 5, 10, 25, 50, 100),
+)
+REQUEST_DB_SECONDS = Histogram(
+    "http_request_db_seconds",
+    "Time spent in MongoDB commands per HTTP request",
+    ["method", "route"],
+)
+MONGO_COMMAND_LATENCY = Histogram(
+    "mongo_command_duration_seconds",
+    "MongoDB command latency",
+    ["command"],
+)
+MONGO_COMMAND_FAILURES = PromCounter(
+    "mongo_command_failures_total",
+    "Failed MongoDB commands",
+    ["command"],
+)
+LOGIN_ATTEMPTS = PromCounter(
+    "login_attempts_total",
+    "Login attempts by admission result",
+    ["result"],
+)
+REPOSITORY_LATENCY = Histogram(
+    "repository_call_duration_seconds",
+    "Repository method latency",
+    ["method"],
+)
+
+
+class RequestStats:
+    __slots__ = ("db_commands", "db_seconds", "repository_calls")
+
+    def __init__(self):
+        self.db_commands = 0
+        self.db_seconds = 0.0
+        self.repository_calls = Counter()
+
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    return _request_stats.get()
+
+
+class MongoCommandListener(monitoring.CommandListener):
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        self._record(event)
+
+    def failed(self, event):
+        MONGO_COMMAND_FAILURES.labels(event.command_name).inc()
+        self._record(event)
+
+    def _record(self, event):
+        seconds = event.duration_micros / 1_000_000
+        MONGO_COMMAND_LATENCY.labels(event.command_name).observe(seconds)
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.db_commands += 1
+            stats.db_seconds += seconds
+
+
+mongo_command_listener = MongoCommandListener()
+
+
+def _track(name, func):
+    if inspect.isasyncgenfunction(func):
+        @functools.wraps(func)
+        async def generator_wrapper(*args, **kwargs):
+            stats = _request_stats.get()
+            if stats is not None:
+                stats.repository_calls[name] += 1
+            async for item in func(*args, **kwargs):
+                yield item
+        return generator_wrapper
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.repository_calls[name] += 1
+        start = time.perf_counter()
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            REPOSITORY_LATENCY.labels(name).observe(time.perf_counter() - start)
+    return wrapper
+
+
+def instrument_repository(cls):
+    for attribute, value in list(vars(cls).items()):
+        if not isinstance(value, staticmethod):
+            continue
+        func = value.__func__
+        if inspect.iscoroutinefunction(func) or inspect.isasyncgenfunction(func):
+            setattr(cls, attribute, staticmethod(_track(f"{cls.__name__}.{attribute}", func)))
+    return cls
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        start = time.perf_counter()
+        status_code = 500
+        response_size = 0
+        first_byte = None
+        streaming = False
+
+        async def send_wrapper(message):
+            nonlocal status_code, response_size, first_byte, streaming
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                first_byte = time.perf_counter()
+            elif message["type"] == "http.response.body":
+                response_size += len(message.get("body", b""))
+                streaming = streaming or message.get("more_body", False)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_stats.reset(token)
+            # SSE e exportações ficam abertos enquanto o cliente lê; para eles mede-se o tempo até o primeiro byte
+            end = first_byte if streaming and first_byte is not None else time.perf_counter()
+            elapsed = end - start
+            self._observe(scope, stats, status_code, response_size, elapsed)
+
+    def _observe(self, scope, stats, status_code, response_size, elapsed):
+        route = getattr(scope.get("route"), "path", None) or "unmatched"
+        method = scope["method"]
+        headers = dict(scope.get("headers") or [])
+        request_size = int(headers.get(b"content-length", 0) or 0)
+
+        REQUEST_LATENCY.labels(method, route, str(status_code)).observe(elapsed)
+        REQUEST_SIZE.labels(method, route).observe(request_size)
+        RESPONSE_SIZE.labels(method, route).observe(response_size)
+        REQUEST_DB_COMMANDS.labels(method, route).observe(stats.db_commands)
+        REQUEST_DB_SECONDS.labels(method, route).observe(stats.db_seconds)
+
+        if elapsed * 1000 >= settings.SLOW_REQUEST_THRESHOLD_MS:
+            calls = ", ".join(f"{name} x{count}" for name, count in stats.repository_calls.items()) or "-"
+            logger.warning(
+                "Requisição lenta: %s %s status=%s tempo=%.1fms db_comandos=%d db_tempo=%.1fms repositórios=[%s]",
+                method,
+                route,
+                status_code,
+                elapsed * 1000,
+                stats.db_commands,
+                stats.db_seconds * 1000,
+                calls,
+            )
+
+
+class StatsCollector:
+    def __init__(self):
+        self._sources = {}
+
+    def register(self, name: str, source) -> None:
+        self._sources[name] = source
+
+    def collect(self):
+        from prometheus_client.core import GaugeMetricFamily
+
+        for name, source in self._sources.items():
+            try:
+                stats = source()
+            except Exception as e:
+                logger.warning("Falha ao coletar métricas de %s: %s", name, e)
+                continue
+            for key, value in stats.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    yield GaugeMetricFamily(f"{name}_{key}", f"{name} {key}", value=value)
+
+
+stats_collector = StatsCollector()
+REGISTRY.register(stats_collector)
+
+
+def render_metrics() -> tuple:
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
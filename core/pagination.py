@@ -0,0 +1,27 @@
+import base64
+import json
+from typing import Optional
+from beanie import PydanticObjectId
+from core.config import settings
+
+
+def clamp_page_size(limit: Optional[int]) -> int:
+    if not limit or limit < 1:
+        return settings.CLIENTS_PAGE_SIZE
+    return min(limit, settings.CLIENTS_MAX_PAGE_SIZE)
+
+
+def encode_cursor(last_id) -> str:
+    raw = json.dumps({"id": str(last_id)}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[PydanticObjectId]:
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return PydanticObjectId(payload["id"])
+    except Exception:
+        raise ValueError("Cursor de paginação inválido.")
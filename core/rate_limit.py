@@ -0,0 +1,126 @@
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_REDIS_TOKEN_BUCKET = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local allowed = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+return {allowed, tostring(tokens)}
+"""
+
+
+def _retry_after(tokens: float, rate: float, cost: float) -> float:
+    return max(cost - tokens, 0) / rate
+
+
+class RateLimitBackend(ABC):
+    @abstractmethod
+    async def take(self, key: str, capacity: float, rate: float, cost: float = 1) -> Tuple[bool, float]:
+        ...
+
+
+class NullRateLimitBackend(RateLimitBackend):
+    async def take(self, key: str, capacity: float, rate: float, cost: float = 1) -> Tuple[bool, float]:
+        return True, 0.0
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._buckets: "OrderedDict[str, tuple]" = OrderedDict()
+
+    async def take(self, key: str, capacity: float, rate: float, cost: float = 1) -> Tuple[bool, float]:
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated) * rate)
+        allowed = tokens >= cost
+        if allowed:
+            tokens -= cost
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.maxsize:
+            self._buckets.popitem(last=False)
+        return allowed, 0.0 if allowed else _retry_after(tokens, rate, cost)
+
+
+class RedisRateLimitBackend(RateLimitBackend):
+    def __init__(self, client):
+        self._client = client
+        self._script = client.register_script(_REDIS_TOKEN_BUCKET)
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisRateLimitBackend":
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise RuntimeError("O pacote 'redis' é necessário para usar o rate limit Redis.")
+        return cls(redis.from_url(url))
+
+    async def take(self, key: str, capacity: float, rate: float, cost: float = 1) -> Tuple[bool, float]:
+        allowed, tokens = await self._script(keys=[key], args=[capacity, rate, time.time(), cost])
+        allowed = bool(int(allowed))
+        return allowed, 0.0 if allowed else _retry_after(float(tokens), rate, cost)
+
+
+def create_rate_limit_backend(kind: str, maxsize: int, redis_url: Optional[str] = None) -> RateLimitBackend:
+    if kind == "redis":
+        return RedisRateLimitBackend.from_url(redis_url)
+    if kind == "memory":
+        return MemoryRateLimitBackend(maxsize=maxsize)
+    return NullRateLimitBackend()
+
+
+class RateLimiter:
+    def __init__(self, backend: RateLimitBackend, namespace: str, capacity: float, per_minute: float):
+        if per_minute <= 0:
+            # taxa zero nunca reabastece o balde: Retry-After infinito e PEXPIRE com divisão por zero
+            raise ValueError(f"A taxa do rate limit {namespace} deve ser maior que zero; use RATE_LIMIT_BACKEND=none para desligar.")
+        self.backend = backend
+        self.namespace = namespace
+        self.capacity = capacity
+        self.rate = per_minute / 60
+
+    async def hit(self, key: str) -> Tuple[bool, float]:
+        try:
+            return await self.backend.take(f"rl:{self.namespace}:{key}", self.capacity, self.rate)
+        except Exception as e:
+            logger.warning("Rate limit %s indisponível, liberando requisição: %s", self.namespace, e)
+            return True, 0.0
+
+
+class ConcurrencyLimiter:
+    # contador em memória: o limite vale por processo, como o executor de hash de senhas que ele protege
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def try_acquire(self) -> bool:
+        if self.in_flight >= self.limit:
+            return False
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        return True
+
+    def release(self) -> None:
+        self.in_flight -= 1
+
+    def stats(self) -> dict:
+        return {"in_flight": self.in_flight, "max_in_flight": self.max_in_flight, "limit": self.limit}
@@ -0,0 +1,45 @@
+import json
+from datetime import date, datetime
+from typing import Any
+from bson import ObjectId
+from fastapi import Response
+from core.config import settings
+from models.response_model import ResponseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is listed in requirements.txt
+    orjson = None
+
+
+def _default(value):
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+    @classmethod
+    def build(cls, success: bool = True, data: Any = None, error: str = None, **kwargs):
+        if error:
+            return cls({"success": False, "data": None, "error": error}, **kwargs)
+        return cls({"success": success, "data": data, "error": None}, **kwargs)
+
+
+def envelope(success: bool = True, data: Any = None, error: str = None):
+    if settings.FAST_JSON_RESPONSES:
+        return FastJSONResponse.build(success=success, data=data, error=error)
+    return ResponseModel.build(success=success, data=data, error=error)
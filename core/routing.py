@@ -0,0 +1,170 @@
+from collections import Counter
+from contextvars import ContextVar
+from typing import Dict, Optional
+from bson.timestamp import Timestamp
+from pymongo.read_preferences import Nearest, Primary, PrimaryPreferred, Secondary, SecondaryPreferred
+from starlette.datastructures import Headers, MutableHeaders
+from core import database
+from core.config import settings
+
+CAUSAL_TOKEN_HEADER = "X-Causal-Token"
+
+READ_PREFERENCES = {
+    "primary": Primary,
+    "primaryPreferred": PrimaryPreferred,
+    "secondary": Secondary,
+    "secondaryPreferred": SecondaryPreferred,
+    "nearest": Nearest,
+}
+
+MIN_MAX_STALENESS_SECONDS = 90
+
+
+def parse_route_policy(policy: str) -> Dict[str, str]:
+    routes = {}
+    for entry in policy.split(","):
+        route, _, mode = (part.strip() for part in entry.partition("="))
+        if not route:
+            continue
+        if mode not in READ_PREFERENCES:
+            raise ValueError(f"Read preference inválida para {route}: {mode or '-'}")
+        routes[route] = mode
+    return routes
+
+
+def build_read_preference(mode: str, max_staleness_seconds: int = 0):
+    if mode == "primary":
+        return Primary()
+    if 0 < max_staleness_seconds < MIN_MAX_STALENESS_SECONDS:
+        raise ValueError(f"MONGODB_MAX_STALENESS_SECONDS deve ser 0 ou pelo menos {MIN_MAX_STALENESS_SECONDS}.")
+    return READ_PREFERENCES[mode](max_staleness=max_staleness_seconds or -1)
+
+
+def encode_causal_token(operation_time: Timestamp) -> str:
+    return f"{operation_time.time}.{operation_time.inc}"
+
+
+def decode_causal_token(value: Optional[str]) -> Optional[Timestamp]:
+    if not value:
+        return None
+    try:
+        seconds, _, increment = value.partition(".")
+        return Timestamp(int(seconds), int(increment))
+    except (TypeError, ValueError):
+        return None
+
+
+class RequestSession:
+    __slots__ = ("session", "operation_time", "wrote")
+
+    def __init__(self, operation_time: Optional[Timestamp] = None):
+        self.session = None
+        self.operation_time = operation_time
+        self.wrote = False
+
+
+_request_session: ContextVar[Optional[RequestSession]] = ContextVar("request_session", default=None)
+
+
+class ReadRouter:
+    def __init__(self, policy: str, max_staleness_seconds: int = 0, enabled: bool = True):
+        self.enabled = enabled
+        self.routes = parse_route_policy(policy)
+        self._preferences = {
+            route: build_read_preference(mode, max_staleness_seconds)
+            for route, mode in self.routes.items()
+        }
+        self._primary = Primary()
+        self._counts = Counter()
+
+    def collection(self, collection, route: str):
+        if not self.enabled:
+            self.record("primary_reads")
+            return collection
+        # rotas fora da política vão ao primary, não ao MONGODB_READ_PREFERENCE do cliente
+        preference = self._preferences.get(route, self._primary)
+        self.record("primary_reads" if preference == self._primary else "secondary_reads")
+        return collection.with_options(read_preference=preference)
+
+    def record(self, event: str) -> None:
+        self._counts[event] += 1
+
+    def stats(self) -> dict:
+        return {
+            "enabled": int(self.enabled),
+            "routes": sum(1 for mode in self.routes.values() if mode != "primary"),
+            "primary_reads": self._counts["primary_reads"],
+            "secondary_reads": self._counts["secondary_reads"],
+            "sessions": self._counts["sessions"],
+            "causal_tokens_received": self._counts["causal_tokens_received"],
+            "causal_tokens_issued": self._counts["causal_tokens_issued"],
+        }
+
+
+read_router = ReadRouter(
+    settings.READ_ROUTING_POLICY,
+    settings.MONGODB_MAX_STALENESS_SECONDS,
+    enabled=settings.READ_ROUTING_ENABLED,
+)
+
+
+def read_collection(collection, route: str):
+    return read_router.collection(collection, route)
+
+
+async def request_session():
+    # sessão causal da requisição atual, aberta no primeiro acesso ao banco
+    state = _request_session.get()
+    if state is None:
+        return None
+    if state.session is None:
+        state.session = await database.get_client().start_session(causal_consistency=True)
+        if state.operation_time is not None:
+            state.session.advance_operation_time(state.operation_time)
+        read_router.record("sessions")
+    return state.session
+
+
+async def write_session():
+    state = _request_session.get()
+    if state is None:
+        return None
+    state.wrote = True
+    return await request_session()
+
+
+def causal_reads_required() -> bool:
+    state = _request_session.get()
+    return state is not None and (state.wrote or state.operation_time is not None)
+
+
+class CausalSessionMiddleware:
+    def __init__(self, app, router: ReadRouter = read_router):
+        self.app = app
+        self.router = router
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.router.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        operation_time = decode_causal_token(Headers(scope=scope).get(CAUSAL_TOKEN_HEADER))
+        if operation_time is not None:
+            self.router.record("causal_tokens_received")
+        state = RequestSession(operation_time)
+        token = _request_session.set(state)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and state.wrote and state.session is not None:
+                operation_time = state.session.operation_time
+                if operation_time is not None:
+                    MutableHeaders(scope=message)[CAUSAL_TOKEN_HEADER] = encode_causal_token(operation_time)
+                    self.router.record("causal_tokens_issued")
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_session.reset(token)
+            if state.session is not None:
+                await state.session.end_session()
@@ -1,10 +1,24 @@
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from passlib.context import CryptContext
-from typing import Union, Any
+from functools import lru_cache
+from pathlib import Path
+from typing import Union, Any, Optional, Tuple
 from core.config import settings
-from jose import JWTError, jwt
-from datetime import datetime, timedelta
+from core.jwt_backends import JWTBackend, create_jwt_backend
+from uuid import uuid4
 
-password_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+password_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+)
+
+_password_executor: Optional[Executor] = None
+_password_semaphore: Optional[asyncio.Semaphore] = None
+_password_stats = {"in_flight": 0, "waiting": 0, "max_waiting": 0, "completed": 0}
 
 def create_password(password: str) -> str:
     return password_context.hash(password)
@@ -12,29 +26,109 @@ def create_password(password: str) -> str:
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return password_context.verify(plain_password, hashed_password)
 
-def create_access_token(data: Union[str, dict], expires_delta: int = None) -> str:
-    if expires_delta:
-        expires_delta = datetime.utcnow() + timedelta(minutes=expires_delta)
-    else:
-        expires_delta = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-        
-    info_jwt = {
-        "exp": expires_delta,
-        "sub": str(data),
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return password_context.verify_and_update(plain_password, hashed_password)
+
+def _get_password_executor() -> Executor:
+    global _password_executor
+    if _password_executor is None:
+        if settings.PASSWORD_HASH_EXECUTOR == "process":
+            _password_executor = ProcessPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS)
+        else:
+            _password_executor = ThreadPoolExecutor(
+                max_workers=settings.PASSWORD_HASH_WORKERS,
+                thread_name_prefix="password-hash",
+            )
+    return _password_executor
+
+def _get_password_semaphore() -> asyncio.Semaphore:
+    global _password_semaphore
+    if _password_semaphore is None:
+        _password_semaphore = asyncio.Semaphore(settings.PASSWORD_HASH_MAX_CONCURRENCY)
+    return _password_semaphore
+
+async def _run_password_work(func, *args):
+    _password_stats["waiting"] += 1
+    _password_stats["max_waiting"] = max(_password_stats["max_waiting"], _password_stats["waiting"])
+    acquired = False
+    try:
+        async with _get_password_semaphore():
+            acquired = True
+            _password_stats["waiting"] -= 1
+            _password_stats["in_flight"] += 1
+            try:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(_get_password_executor(), func, *args)
+            finally:
+                _password_stats["in_flight"] -= 1
+                _password_stats["completed"] += 1
+    finally:
+        if not acquired:
+            _password_stats["waiting"] -= 1
+
+async def create_password_async(password: str) -> str:
+    return await _run_password_work(create_password, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return await _run_password_work(verify_and_update_password, plain_password, hashed_password)
+
+def password_pool_stats() -> dict:
+    return {
+        **_password_stats,
+        "workers": settings.PASSWORD_HASH_WORKERS,
+        "max_concurrency": settings.PASSWORD_HASH_MAX_CONCURRENCY,
     }
-    jwt_encoded =  jwt.encode(info_jwt, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
-    return jwt_encoded
 
+def shutdown_password_executor() -> None:
+    global _password_executor
+    if _password_executor is not None:
+        _password_executor.shutdown(wait=False, cancel_futures=True)
+        _password_executor = None
 
-def create_refresh_token(data: Union[str, dict], expires_delta: int = None) -> str:
-    if expires_delta:
-        expires_delta = datetime.utcnow() + timedelta(minutes=expires_delta)
-    else:
-        expires_delta = datetime.utcnow() + timedelta(minutes=settings.ACCESS_REFRESH_TOKEN_SECRET_KEY)
-        
-    info_jwt = {
-        "exp": expires_delta,
+def _read_key(path: str) -> Optional[str]:
+    return Path(path).read_text() if path else None
+
+@lru_cache(maxsize=None)
+def access_token_backend() -> JWTBackend:
+    return create_jwt_backend(
+        settings.JWT_BACKEND,
+        settings.ALGORITHM,
+        secret=settings.SECRET_KEY,
+        private_key=_read_key(settings.JWT_PRIVATE_KEY_FILE),
+        public_key=_read_key(settings.JWT_PUBLIC_KEY_FILE),
+        key_id=settings.JWT_KEY_ID or None,
+    )
+
+@lru_cache(maxsize=None)
+def refresh_token_backend() -> JWTBackend:
+    algorithm = settings.ALGORITHM if settings.ALGORITHM.startswith("HS") else "HS256"
+    return create_jwt_backend(settings.JWT_BACKEND, algorithm, secret=settings.REFRESH_SECRET_KEY)
+
+def _token_claims(data: Union[str, dict], expires_delta: int) -> dict:
+    now = time.time()
+    issued_at = int(now)
+    return {
+        "exp": issued_at + expires_delta * 60,
+        # em milissegundos para comparar com o corte de revogação do usuário sem empatar no mesmo segundo
+        "iat": int(now * 1000) / 1000,
+        "jti": uuid4().hex,
         "sub": str(data),
     }
-    jwt_encoded =  jwt.encode(info_jwt, settings.REFRESH_SECRET_KEY, algorithm=settings.ALGORITHM)
-    return jwt_encoded
\ No newline at end of file
+
+
+def create_access_token(data: Union[str, dict], expires_delta: int = None) -> str:
+    info_jwt = _token_claims(data, expires_delta or settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    return access_token_backend().encode(info_jwt)
+
+
+def create_refresh_token(data: Union[str, dict], expires_delta: int = None) -> str:
+    info_jwt = _token_claims(data, expires_delta or settings.ACCESS_REFRESH_TOKEN_SECRET_KEY)
+    return refresh_token_backend().encode(info_jwt)
+
+
+def decode_access_token(token: str) -> dict:
+    return access_token_backend().decode(token)
+
+
+def decode_refresh_token(token: str) -> dict:
+    return refresh_token_backend().decode(token)
@@ -0,0 +1,88 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from typing import AsyncIterator, Iterable, List, Optional
+from fastapi import Request
+from core.config import settings
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def clamp_batch_size(batch_size: Optional[int]) -> int:
+    if not batch_size or batch_size < 1:
+        return settings.EXPORT_BATCH_SIZE
+    return min(batch_size, settings.EXPORT_MAX_BATCH_SIZE)
+
+
+def _default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def ndjson_chunk(rows: Iterable[dict]) -> bytes:
+    return "".join(json.dumps(row, default=_default, ensure_ascii=False) + "\n" for row in rows).encode()
+
+
+def csv_chunk(rows: Iterable[dict], columns: Iterable[str], header: bool = False) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=list(columns), extrasaction="ignore")
+    if header:
+        writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue().encode()
+
+
+async def encode_rows(rows: AsyncIterator[dict], fmt: str, columns: Iterable[str], batch_size: int) -> AsyncIterator[bytes]:
+    batch = []
+    first = True
+    async for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield ndjson_chunk(batch) if fmt == "ndjson" else csv_chunk(batch, columns, header=first)
+            batch = []
+            first = False
+    if batch or (first and fmt == "csv"):
+        yield ndjson_chunk(batch) if fmt == "ndjson" else csv_chunk(batch, columns, header=first)
+
+
+def parse_rows(content: bytes, fmt: str) -> List[dict]:
+    text = content.decode("utf-8-sig")
+    if fmt == "csv":
+        return [dict(row) for row in csv.DictReader(io.StringIO(text))]
+    if fmt == "ndjson":
+        return [json.loads(line) for line in text.splitlines() if line.strip()]
+    rows = json.loads(text)
+    if not isinstance(rows, list):
+        raise ValueError("O corpo da requisição deve ser uma lista de registros.")
+    return rows
+
+
+def _format_from(content_type: str, filename: str = "") -> str:
+    if filename.endswith(".csv") or "csv" in content_type:
+        return "csv"
+    if filename.endswith((".ndjson", ".jsonl")) or "ndjson" in content_type:
+        return "ndjson"
+    return "json"
+
+
+async def read_import_rows(request: Request) -> List[dict]:
+    content_type = request.headers.get("content-type", "")
+    try:
+        if content_type.startswith("multipart/form-data"):
+            form = await request.form()
+            upload = form.get("file")
+            if upload is None or isinstance(upload, str):
+                raise ValueError("Envie o arquivo no campo 'file'.")
+            rows = parse_rows(await upload.read(), _format_from(upload.content_type or "", upload.filename or ""))
+        else:
+            rows = parse_rows(await request.body(), _format_from(content_type))
+    except (UnicodeDecodeError, json.JSONDecodeError, csv.Error):
+        raise ValueError("Não foi possível ler os registros enviados.")
+    if len(rows) > settings.IMPORT_MAX_ROWS:
+        raise ValueError(f"Limite de {settings.IMPORT_MAX_ROWS} registros por importação excedido.")
+    return rows
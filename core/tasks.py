@@ -0,0 +1,13 @@
+import asyncio
+import contextvars
+from typing import Coroutine
+
+_tasks = set()
+
+
+def spawn(coro: Coroutine) -> asyncio.Task:
+    # contexto vazio: a tarefa não herda métricas nem a sessão da requisição que a disparou
+    task = contextvars.Context().run(asyncio.ensure_future, coro)
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+    return task
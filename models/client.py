@@ -1,8 +1,11 @@
 from beanie import Document
 from pydantic import BaseModel
+from pymongo import ASCENDING, TEXT, IndexModel
 from datetime import datetime
 from typing import Optional
 from .base_model import BaseEntity
+
+ACTIVE = {"disabled": False}
     
 class Client(Document, BaseEntity):
     name: str
@@ -13,9 +16,36 @@ class Client(Document, BaseEntity):
     state: str
     zip_code: str
     disabled: bool = False 
+    disabled_at: Optional[datetime] = None
+    revision: int = 0
+    name_normalized: Optional[str] = None
+    email_normalized: Optional[str] = None
+    phone_normalized: Optional[str] = None
 
     class Settings:
         name = "clients"
+        indexes = [
+            # só clientes ativos reservam e-mail e telefone; desativados podem ser recadastrados
+            IndexModel([("email", ASCENDING)], name="active_email_unique", unique=True, partialFilterExpression=ACTIVE),
+            IndexModel([("phone", ASCENDING)], name="active_phone_unique", unique=True, partialFilterExpression=ACTIVE),
+            IndexModel([("created_at", ASCENDING), ("_id", ASCENDING)], name="created_at_id"),
+            IndexModel([("state", ASCENDING), ("city", ASCENDING), ("disabled", ASCENDING)], name="state_city_disabled"),
+            IndexModel([("disabled", ASCENDING), ("_id", ASCENDING)], name="active_id", partialFilterExpression=ACTIVE),
+            IndexModel([("name_normalized", ASCENDING)], name="active_name_normalized", partialFilterExpression=ACTIVE),
+            IndexModel([("email_normalized", ASCENDING)], name="active_email_normalized", partialFilterExpression=ACTIVE),
+            IndexModel([("phone_normalized", ASCENDING)], name="active_phone_normalized", partialFilterExpression=ACTIVE),
+            IndexModel(
+                [("disabled", ASCENDING), ("disabled_at", ASCENDING)],
+                name="inactive_disabled_at",
+                partialFilterExpression={"disabled": True},
+            ),
+            IndexModel(
+                [("name", TEXT), ("email", TEXT), ("city", TEXT), ("address", TEXT)],
+                name="client_text",
+                weights={"name": 10, "email": 5, "city": 2, "address": 1},
+                default_language="none",
+            ),
+        ]
 
 class ClientCreateUpdate(BaseModel):
     name: str
@@ -26,3 +56,12 @@ class ClientCreateUpdate(BaseModel):
     state: str
     zip_code: str
 
+
+class ClientPatch(BaseModel):
+    name: Optional[str] = None
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    address: Optional[str] = None
+    city: Optional[str] = None
+    state: Optional[str] = None
+    zip_code: Optional[str] = None
@@ -0,0 +1,20 @@
+from beanie import Document
+from pymongo import ASCENDING, IndexModel
+from datetime import datetime
+from typing import Optional
+
+
+class RevokedToken(Document):
+    jti: str
+    user_id: str
+    not_before: Optional[datetime] = None
+    created_at: datetime
+    expires_at: datetime
+
+    class Settings:
+        name = "revoked_tokens"
+        indexes = [
+            IndexModel([("jti", ASCENDING)], name="jti_1", unique=True),
+            IndexModel([("created_at", ASCENDING)], name="created_at"),
+            IndexModel([("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=0),
+        ]
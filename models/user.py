@@ -1,4 +1,5 @@
-from beanie import Document, Indexed
+from beanie import Document
+from pymongo import ASCENDING, IndexModel
 from uuid import UUID, uuid4
 from pydantic import BaseModel, EmailStr, Field
 from datetime import datetime
@@ -6,9 +7,9 @@ from typing import Optional, List
 from .base_model import BaseEntity
 
 class User(Document, BaseEntity):
-    name : Indexed(str)
-    username: Indexed(str, unique=True)
-    email: Indexed(EmailStr, unique=True)
+    name : str
+    username: str
+    email: EmailStr
     hash_password: str
     disabled: bool = False
     
@@ -27,4 +28,9 @@ class User(Document, BaseEntity):
         return False
     
     class Settings:
-        name = "users"
\ No newline at end of file
+        name = "users"
+        indexes = [
+            IndexModel([("name", ASCENDING)], name="name_1"),
+            IndexModel([("username", ASCENDING)], name="username_1", unique=True),
+            IndexModel([("email", ASCENDING)], name="email_1", unique=True),
+        ]
\ No newline at end of file
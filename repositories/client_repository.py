@@ -1,46 +1,426 @@
+import asyncio
+import json
+import re
 from models.client import Client, ClientCreateUpdate
+from schemas.client_schema import clientSearchFields
 from datetime import datetime
 from beanie import PydanticObjectId
+from bson import ObjectId
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from core.cache import ReadThroughCache, create_cache_backend
+from core.config import settings
+from core.metrics import instrument_repository
+from core.exceptions import PreconditionFailedError
+from core.change_feed import ChangeFeed
+from core.loader import BatchLoader
+from core.responses import dumps
+from core.routing import causal_reads_required, read_collection, request_session, write_session
+from repositories.version_repository import CollectionVersionRepository
 
+client_cache = ReadThroughCache(
+    create_cache_backend(
+        settings.CLIENT_CACHE_BACKEND,
+        maxsize=settings.CLIENT_CACHE_SIZE,
+        ttl=settings.CLIENT_CACHE_TTL_SECONDS,
+        redis_url=settings.CACHE_REDIS_URL,
+    ),
+    namespace="clients",
+    ttl=settings.CLIENT_CACHE_TTL_SECONDS,
+    bypass=causal_reads_required,
+)
+
+
+def _dump(document) -> dict:
+    return document.model_dump(mode="json", by_alias=True)
+
+
+DOCUMENT_PROJECTION = {"name_normalized": 0, "email_normalized": 0, "phone_normalized": 0}
+
+ARCHIVE_COLLECTION = "clients_archive"
+
+
+def _archive():
+    return Client.get_motor_collection().database[ARCHIVE_COLLECTION]
+
+
+async def _find_client_documents(client_ids, session=None):
+    collection = read_collection(Client.get_motor_collection(), "clients.get")
+    cursor = collection.find({"_id": {"$in": list(client_ids)}}, DOCUMENT_PROJECTION, session=session)
+    return {document["_id"]: document async for document in cursor}
+
+
+client_document_loader = BatchLoader(_find_client_documents, max_batch_size=settings.BATCH_MAX_IDS)
+
+
+_HIDDEN_CHANGE_FIELDS = ("name_normalized", "email_normalized", "phone_normalized")
+
+client_change_feed = ChangeFeed(
+    lambda: Client.get_motor_collection(),
+    pipeline=[{"$project": {
+        **{f"fullDocument.{field}": 0 for field in _HIDDEN_CHANGE_FIELDS},
+        **{f"updateDescription.updatedFields.{field}": 0 for field in _HIDDEN_CHANGE_FIELDS},
+    }}],
+    queue_size=settings.CHANGE_FEED_QUEUE_SIZE,
+    buffer_size=settings.CHANGE_FEED_BUFFER_SIZE,
+)
+
+
+async def _invalidate_clients():
+    # as chaves carregam a versão (ou a revisão): uma leitura iniciada antes da escrita
+    # grava numa chave que ninguém mais consulta, em vez de ressuscitar o valor antigo
+    await CollectionVersionRepository.bump(Client)
+    await client_cache.bump_version()
+
+
+@instrument_repository
 class ClientRepository:
     @staticmethod
-    async def list_clients():
-        return await Client.find_all().to_list()
+    async def list_clients(after_id=None, limit=None):
+        async def load():
+            session = await request_session()
+            query = {"disabled": False, "_id": {"$gt": after_id}} if after_id else {"disabled": False}
+            query = Client.find(query, session=session).sort("+_id")
+            if limit:
+                query = query.limit(limit)
+            return await query.to_list()
+
+        version = await client_cache.version()
+        if version < 0:
+            return await load()
+        return await client_cache.get_or_load(
+            f"list:v{version}:{after_id}:{limit}",
+            load,
+            encode=lambda documents: json.dumps([_dump(document) for document in documents]).encode(),
+            decode=lambda raw: [Client.model_validate(item) for item in json.loads(raw)],
+            ttl=settings.CLIENT_CACHE_LIST_TTL_SECONDS,
+        )
+
+    @staticmethod
+    async def list_client_documents(after_id=None, limit=None, fields=None, version=None):
+        async def load():
+            query = {"disabled": False}
+            if after_id:
+                query["_id"] = {"$gt": ObjectId(str(after_id))}
+            projection = {field: 1 for field in fields} if fields else DOCUMENT_PROJECTION
+            collection = read_collection(Client.get_motor_collection(), "clients.list")
+            cursor = collection.find(query, projection, session=await request_session()).sort("_id", 1)
+            if limit:
+                cursor = cursor.limit(limit)
+            return await cursor.to_list(length=limit)
+
+        if version is None:
+            version = await client_cache.version()
+            if version < 0:
+                return await load()
+        else:
+            version = f"db{version}"
+        return await client_cache.get_or_load(
+            f"docs:v{version}:{after_id}:{limit}:{','.join(sorted(fields)) if fields else '*'}",
+            load,
+            encode=dumps,
+            decode=json.loads,
+            ttl=settings.CLIENT_CACHE_LIST_TTL_SECONDS,
+        )
+
+    @staticmethod
+    def cache_stats():
+        return client_cache.stats()
+
+    @staticmethod
+    def loader_stats():
+        return client_document_loader.stats()
+
+    @staticmethod
+    def change_feed_stats():
+        return client_change_feed.stats()
+
+    @staticmethod
+    def stream_changes(last_event_id=None, heartbeat=None):
+        return client_change_feed.stream(last_event_id, heartbeat or settings.CHANGE_FEED_HEARTBEAT_SECONDS)
+
+    @staticmethod
+    async def get_client_documents(client_ids):
+        return await _find_client_documents(client_ids, await request_session())
+
+    @staticmethod
+    async def list_clients_before(before_id, limit):
+        query = Client.find({"disabled": False, "_id": {"$lt": before_id}}, session=await request_session())
+        query = query.sort("-_id").limit(limit)
+        clients = await query.to_list()
+        clients.reverse()
+        return clients
+
+    @staticmethod
+    async def iter_client_documents(batch_size):
+        collection = read_collection(Client.get_motor_collection(), "clients.export")
+        cursor = collection.find({}, DOCUMENT_PROJECTION, batch_size=batch_size, session=await request_session())
+        cursor = cursor.sort("_id", 1)
+        async for document in cursor:
+            yield document
 
     @staticmethod
     async def create_client(client: ClientCreateUpdate):
         client_db = Client(
             **dict(client),
-            created_at=datetime.now(),
+            **clientSearchFields(client),
+            created_at=datetime.utcnow(),
         )
-        await client_db.insert()
+        try:
+            await client_db.insert(session=await write_session())
+        except DuplicateKeyError:
+            raise ValueError("Já existe um cliente com este e-mail ou telefone.")
+        await _invalidate_clients()
         return client_db
 
     @staticmethod
-    async def get_client(client_id):
-        return await Client.get(PydanticObjectId(client_id))
+    async def insert_many(clients, chunk_size):
+        now = datetime.utcnow()
+        documents = [
+            {
+                "_id": ObjectId(),
+                **dict(client),
+                **clientSearchFields(client),
+                "created_at": now,
+                "updated_at": None,
+                "disabled": False,
+                "disabled_at": None,
+                "revision": 0,
+            }
+            for client in clients
+        ]
+        collection = Client.get_motor_collection()
+        session = await write_session()
+        errors = {}
+        for start in range(0, len(documents), chunk_size):
+            try:
+                await collection.insert_many(documents[start:start + chunk_size], ordered=False, session=session)
+            except BulkWriteError as bwe:
+                for error in bwe.details.get("writeErrors", []):
+                    errors[start + error["index"]] = error.get("code")
+        await _invalidate_clients()
+        return [(document["_id"], errors.get(index)) for index, document in enumerate(documents)]
+
+    @staticmethod
+    async def find_existing_contacts(emails, phones):
+        cursor = Client.get_motor_collection().find(
+            # disabled em cada ramo do $or: casa com os índices únicos parciais de clientes ativos
+            {"$or": [
+                {"email": {"$in": list(emails)}, "disabled": False},
+                {"phone": {"$in": list(phones)}, "disabled": False},
+            ]},
+            {"_id": 0, "email": 1, "phone": 1},
+            session=await request_session(),
+        )
+        existing_emails, existing_phones = set(), set()
+        async for document in cursor:
+            existing_emails.add(document.get("email"))
+            existing_phones.add(document.get("phone"))
+        return existing_emails, existing_phones
+
+    @staticmethod
+    async def search_clients(text=None, prefix_field=None, prefix=None, filters=None, skip=0, limit=None):
+        query = dict(filters or {})
+        if text:
+            query["$text"] = {"$search": text}
+        if prefix_field:
+            query[prefix_field] = {"$regex": "^" + re.escape(prefix)}
+        collection = read_collection(Client.get_motor_collection(), "clients.search")
+        session = await request_session()
+        if text:
+            cursor = collection.find(query, {"score": {"$meta": "textScore"}}, session=session)
+            cursor = cursor.sort([("score", {"$meta": "textScore"}), ("_id", 1)])
+        else:
+            cursor = collection.find(query, session=session).sort([(prefix_field or "_id", 1), ("_id", 1)])
+        return await cursor.skip(skip).limit(limit).to_list(length=limit)
+
+    @staticmethod
+    async def client_stats(since, top):
+        async def load():
+            # as duas agregações rodam em paralelo, então não compartilham a sessão da requisição
+            collection = read_collection(Client.get_motor_collection(), "clients.stats")
+            location_pipeline = [
+                {"$sort": {"state": 1, "city": 1, "disabled": 1}},
+                {"$group": {
+                    "_id": {"state": "$state", "city": "$city", "disabled": "$disabled"},
+                    "count": {"$sum": 1},
+                }},
+                {"$facet": {
+                    "status": [
+                        {"$group": {"_id": {"$ifNull": ["$_id.disabled", False]}, "count": {"$sum": "$count"}}},
+                    ],
+                    "by_state": [
+                        {"$group": {"_id": "$_id.state", "count": {"$sum": "$count"}}},
+                        {"$sort": {"count": -1, "_id": 1}},
+                        {"$limit": top},
+                    ],
+                    "by_city": [
+                        {"$group": {"_id": {"state": "$_id.state", "city": "$_id.city"}, "count": {"$sum": "$count"}}},
+                        {"$sort": {"count": -1, "_id.state": 1, "_id.city": 1}},
+                        {"$limit": top},
+                    ],
+                }},
+            ]
+            daily_pipeline = [
+                {"$match": {"created_at": {"$gte": since}}},
+                {"$group": {
+                    "_id": {"$dateToString": {"format": "%Y-%m-%d", "date": "$created_at"}},
+                    "count": {"$sum": 1},
+                }},
+                {"$sort": {"_id": 1}},
+            ]
+            locations, daily = await asyncio.gather(
+                collection.aggregate(location_pipeline).to_list(length=1),
+                collection.aggregate(daily_pipeline).to_list(length=None),
+            )
+            return {**(locations[0] if locations else {}), "daily": daily}
+
+        return await client_cache.get_or_load(
+            f"stats:{since.date().isoformat()}:{top}",
+            load,
+            encode=dumps,
+            decode=json.loads,
+            ttl=settings.CLIENT_STATS_TTL_SECONDS,
+        )
+
+    @staticmethod
+    async def backfill_search_fields(batch_size):
+        collection = Client.get_motor_collection()
+        cursor = collection.find(
+            {"phone_normalized": {"$exists": False}},
+            {"name": 1, "email": 1, "phone": 1},
+            batch_size=batch_size,
+        )
+        operations = []
+        updated = 0
+        async for document in cursor:
+            operations.append(UpdateOne({"_id": document["_id"]}, {"$set": clientSearchFields(document)}))
+            if len(operations) >= batch_size:
+                await collection.bulk_write(operations, ordered=False)
+                updated += len(operations)
+                operations = []
+        if operations:
+            await collection.bulk_write(operations, ordered=False)
+            updated += len(operations)
+        return updated
+
+    @staticmethod
+    async def get_client_document(client_id, revision=None):
+        client_id = PydanticObjectId(client_id)
+        if causal_reads_required():
+            # quem acabou de escrever lê pela própria sessão, sem cache nem lote compartilhado
+            documents = await _find_client_documents([client_id], await request_session())
+            return documents.get(client_id)
+        if revision is None:
+            return await client_document_loader.load(client_id)
+        # a revisão na chave impede que um corpo antigo acompanhe validadores novos
+        return await client_cache.get_or_load(
+            f"doc:{client_id}:r{revision}",
+            lambda: client_document_loader.load(client_id),
+            encode=dumps,
+            decode=json.loads,
+        )
+
+    @staticmethod
+    async def collection_version(route="clients.get"):
+        return await CollectionVersionRepository.get(Client, route)
+
+    @staticmethod
+    async def get_client_validators(client_id):
+        if not ObjectId.is_valid(client_id):
+            return None
+        return await read_collection(Client.get_motor_collection(), "clients.get").find_one(
+            {"_id": ObjectId(client_id)},
+            {"revision": 1, "created_at": 1, "updated_at": 1},
+            session=await request_session(),
+        )
 
     @staticmethod
-    async def find_duplicate(email, phone, exclude_id=None):
-        query = {"$or": [{"email": email}, {"phone": phone}]}
-        if exclude_id:
-            query = {"$and": [
-                {"_id": {"$ne": PydanticObjectId(exclude_id)}},
-                query
-            ]}
-        return await Client.find_one(query)
+    async def update_client(client_id, changes: dict, expected_revision=None):
+        client_id = PydanticObjectId(client_id)
+        update_data = dict(changes)
+        update_data.update({
+            key: value
+            for key, value in clientSearchFields(changes).items()
+            if key.removesuffix("_normalized") in changes
+        })
+        update_data["updated_at"] = datetime.utcnow()
+        query = {"_id": client_id}
+        if expected_revision is not None:
+            query["revision"] = expected_revision if expected_revision else {"$in": [0, None]}
+        collection = Client.get_motor_collection()
+        session = await write_session()
+        try:
+            document = await collection.find_one_and_update(
+                query,
+                {"$set": update_data, "$inc": {"revision": 1}},
+                return_document=ReturnDocument.AFTER,
+                session=session,
+            )
+        except DuplicateKeyError:
+            raise ValueError("Já existe outro cliente com este e-mail ou telefone.")
+        if document is None:
+            if expected_revision is not None and await collection.count_documents({"_id": client_id}, limit=1, session=session):
+                raise PreconditionFailedError("O cliente foi alterado por outra requisição.")
+            return None
+        await _invalidate_clients()
+        return Client.model_validate(document)
 
     @staticmethod
-    async def update_client(client_id, client: ClientCreateUpdate, created_at):
-        update_data = dict(client)
-        update_data["updated_at"] = datetime.now()
-        update_data["created_at"] = created_at
-        await Client.find_one(Client.id == PydanticObjectId(client_id)).set(update_data)
-        return await Client.get(PydanticObjectId(client_id))
+    async def set_client_disabled(client_id, disabled):
+        client_id = PydanticObjectId(client_id)
+        now = datetime.utcnow()
+        update = {"$set": {"disabled": disabled, "updated_at": now}, "$inc": {"revision": 1}}
+        if disabled:
+            update["$set"]["disabled_at"] = now
+        else:
+            update["$unset"] = {"disabled_at": ""}
+        collection = Client.get_motor_collection()
+        session = await write_session()
+        try:
+            document = await collection.find_one_and_update(
+                {"_id": client_id, "disabled": not disabled},
+                update,
+                projection=DOCUMENT_PROJECTION,
+                return_document=ReturnDocument.AFTER,
+                session=session,
+            )
+        except DuplicateKeyError:
+            # o e-mail ou telefone foi recadastrado enquanto o cliente estava desativado
+            raise ValueError("Já existe um cliente ativo com este e-mail ou telefone.")
+        if document is None:
+            if await collection.count_documents({"_id": client_id}, limit=1, session=session):
+                raise ValueError("O cliente já está desativado." if disabled else "O cliente já está ativo.")
+            return None
+        await _invalidate_clients()
+        return document
 
     @staticmethod
-    async def delete_client(client_id):
-        client = await Client.get(PydanticObjectId(client_id))
-        if client:
-            await client.delete()
-        return client
+    async def archive_disabled(disabled_before, batch_size):
+        collection = Client.get_motor_collection()
+        archive = _archive()
+        query = {"disabled": True, "disabled_at": {"$lt": disabled_before}}
+        archived = 0
+        while True:
+            cursor = collection.find(query).sort([("disabled", 1), ("disabled_at", 1)]).limit(batch_size)
+            documents = await cursor.to_list(length=batch_size)
+            if not documents:
+                break
+            now = datetime.utcnow()
+            try:
+                await archive.insert_many([{**document, "archived_at": now} for document in documents], ordered=False)
+            except BulkWriteError as bwe:
+                # cópias de uma execução interrompida já estão no arquivo
+                if any(error.get("code") != 11000 for error in bwe.details.get("writeErrors", [])):
+                    raise
+            ids = [document["_id"] for document in documents]
+            result = await collection.delete_many({**query, "_id": {"$in": ids}})
+            if result.deleted_count < len(ids):
+                # restaurados entre a cópia e a remoção continuam ativos; tira a cópia do arquivo
+                restored = await collection.distinct("_id", {"_id": {"$in": ids}})
+                await archive.delete_many({"_id": {"$in": restored}})
+            await client_cache.bump_version()
+            archived += result.deleted_count
+            if len(documents) < batch_size:
+                break
+        return archived
@@ -0,0 +1,35 @@
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from core import database
+from core.metrics import instrument_repository
+
+LEASES_COLLECTION = "leases"
+
+# identifica este processo entre os workers e réplicas que disputam o mesmo lease
+PROCESS_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def _leases():
+    return database.get_database()[LEASES_COLLECTION]
+
+
+@instrument_repository
+class LeaseRepository:
+    @staticmethod
+    async def acquire(name: str, seconds: int, owner: str = PROCESS_ID) -> bool:
+        now = datetime.utcnow()
+        try:
+            document = await _leases().find_one_and_update(
+                {"_id": name, "$or": [{"owner": owner}, {"expires_at": {"$lt": now}}]},
+                {"$set": {"owner": owner, "expires_at": now + timedelta(seconds=seconds)}},
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+            )
+        except DuplicateKeyError:
+            # outro processo detém o lease e ele ainda não expirou
+            return False
+        return document is not None and document["owner"] == owner
@@ -0,0 +1,44 @@
+from datetime import datetime
+from typing import List, Optional
+from pymongo.errors import DuplicateKeyError
+from models.token import RevokedToken
+from core.metrics import instrument_repository
+
+REVOKED_TOKEN_PROJECTION = {"_id": 0, "jti": 1, "user_id": 1, "not_before": 1, "created_at": 1, "expires_at": 1}
+
+@instrument_repository
+class RevokedTokenRepository:
+    @staticmethod
+    async def insert(jti: str, user_id: str, created_at: datetime, expires_at: datetime) -> bool:
+        try:
+            await RevokedToken.get_motor_collection().insert_one({
+                "jti": jti,
+                "user_id": user_id,
+                "not_before": None,
+                "created_at": created_at,
+                "expires_at": expires_at,
+            })
+            return True
+        except DuplicateKeyError:
+            return False
+
+    @staticmethod
+    async def set_user_cutoff(user_id: str, not_before: datetime, expires_at: datetime) -> None:
+        await RevokedToken.get_motor_collection().update_one(
+            {"jti": f"user:{user_id}"},
+            {"$set": {
+                "user_id": user_id,
+                "not_before": not_before,
+                "created_at": not_before,
+                "expires_at": expires_at,
+            }},
+            upsert=True,
+        )
+
+    @staticmethod
+    async def list_active(now: datetime, since: Optional[datetime] = None) -> List[dict]:
+        query = {"expires_at": {"$gt": now}}
+        if since is not None:
+            query["created_at"] = {"$gte": since}
+        cursor = RevokedToken.get_motor_collection().find(query, REVOKED_TOKEN_PROJECTION)
+        return await cursor.to_list(length=None)
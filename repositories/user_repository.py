@@ -1,31 +1,95 @@
 from models.user import User
-from typing import List, Optional
+from schemas.user_schema import USER_RECORD_PROJECTION, UserRecord
+from typing import AsyncIterator, Dict, List, Optional
 from beanie import PydanticObjectId
+from core.config import settings
+from core.loader import BatchLoader
+from core.metrics import instrument_repository
+from core.routing import causal_reads_required, read_collection, request_session, write_session
+from repositories.version_repository import CollectionVersionRepository
 
+async def _find_users(user_ids, session=None):
+    users = await User.find({"_id": {"$in": list(user_ids)}}, session=session).to_list()
+    return {user.id: user for user in users}
+
+
+user_loader = BatchLoader(_find_users, max_batch_size=settings.BATCH_MAX_IDS)
+
+
+@instrument_repository
 class UserRepository:
     @staticmethod
     async def insert_user(user: User) -> User:
-        await user.insert()
+        await user.insert(session=await write_session())
+        await CollectionVersionRepository.bump(User)
         return user
 
     @staticmethod
     async def get_user_by_id(user_id: PydanticObjectId) -> Optional[User]:
-        return await User.get(user_id)
+        return await User.get(user_id, session=await request_session())
+
+    @staticmethod
+    async def load_user(user_id: PydanticObjectId) -> Optional[User]:
+        if causal_reads_required():
+            users = await _find_users([user_id], await request_session())
+            return users.get(user_id)
+        return await user_loader.load(user_id)
+
+    @staticmethod
+    def loader_stats() -> dict:
+        return user_loader.stats()
 
     @staticmethod
     async def get_all_users() -> List[User]:
-        return await User.find_all().to_list()
+        return await User.find_all(session=await request_session()).to_list()
+
+    @staticmethod
+    async def get_user_record(user_id: PydanticObjectId) -> Optional[UserRecord]:
+        collection = read_collection(User.get_motor_collection(), "users.get")
+        document = await collection.find_one({"_id": user_id}, USER_RECORD_PROJECTION, session=await request_session())
+        return UserRecord.from_document(document) if document else None
+
+    @staticmethod
+    async def get_user_records(user_ids: List[PydanticObjectId]) -> Dict[PydanticObjectId, UserRecord]:
+        collection = read_collection(User.get_motor_collection(), "users.get")
+        cursor = collection.find({"_id": {"$in": list(user_ids)}}, USER_RECORD_PROJECTION, session=await request_session())
+        return {document["_id"]: UserRecord.from_document(document) async for document in cursor}
+
+    @staticmethod
+    async def get_all_user_records() -> List[UserRecord]:
+        collection = read_collection(User.get_motor_collection(), "users.list")
+        cursor = collection.find({}, USER_RECORD_PROJECTION, session=await request_session()).sort("_id", 1)
+        return [UserRecord.from_document(document) async for document in cursor]
+
+    @staticmethod
+    async def iter_user_records(batch_size: int) -> AsyncIterator[UserRecord]:
+        collection = read_collection(User.get_motor_collection(), "users.export")
+        cursor = collection.find({}, USER_RECORD_PROJECTION, batch_size=batch_size, session=await request_session())
+        cursor = cursor.sort("_id", 1)
+        async for document in cursor:
+            yield UserRecord.from_document(document)
+
+    @staticmethod
+    async def collection_version(route: str = "users.get"):
+        return await CollectionVersionRepository.get(User, route)
 
     @staticmethod
     async def update_user(user: User) -> User:
-        await user.save()
+        await user.save(session=await write_session())
+        await CollectionVersionRepository.bump(User)
+        return user
+
+    @staticmethod
+    async def update_password_hash(user: User, hash_password: str) -> User:
+        await user.set({User.hash_password: hash_password}, session=await write_session())
         return user
 
     @staticmethod
     async def delete_user(user: User) -> bool:
-        await user.delete()
+        await user.delete(session=await write_session())
+        await CollectionVersionRepository.bump(User)
         return True
     
     @staticmethod
     async def get_user_by_username(username: str) -> Optional[User]:
-        return await User.find_one(User.username == username)
+        return await User.find_one(User.username == username, session=await request_session())
@@ -0,0 +1,33 @@
+from datetime import datetime
+from typing import Optional, Tuple, Type
+from beanie import Document
+from core.metrics import instrument_repository
+from core.routing import read_collection, request_session, write_session
+
+VERSIONS_COLLECTION = "collection_versions"
+
+
+def _versions(model: Type[Document]):
+    return model.get_motor_collection().database[VERSIONS_COLLECTION]
+
+
+@instrument_repository
+class CollectionVersionRepository:
+    @staticmethod
+    async def get(model: Type[Document], route: str = "versions") -> Tuple[int, Optional[datetime]]:
+        document = await read_collection(_versions(model), route).find_one(
+            {"_id": model.get_collection_name()},
+            session=await request_session(),
+        )
+        if not document:
+            return 0, None
+        return document.get("version", 0), document.get("updated_at")
+
+    @staticmethod
+    async def bump(model: Type[Document]) -> None:
+        await _versions(model).update_one(
+            {"_id": model.get_collection_name()},
+            {"$inc": {"version": 1}, "$set": {"updated_at": datetime.utcnow()}},
+            upsert=True,
+            session=await write_session(),
+        )
@@ -1,4 +1,5 @@
 from pydantic import BaseModel, EmailStr, Field
+from typing import Optional
 
 
 class TokenSchema(BaseModel):
@@ -8,4 +9,6 @@ class TokenSchema(BaseModel):
     
 class TokenData(BaseModel):
     sub: str = None
-    exp: int = None
\ No newline at end of file
+    exp: int = None
+    iat: Optional[float] = None
+    jti: Optional[str] = None
\ No newline at end of file
@@ -1,5 +1,27 @@
-def clientEntity(db_item) -> dict:
-    return {
+import re
+import unicodedata
+from typing import Optional
+from core.exceptions import PreconditionFailedError
+
+CLIENT_FIELDS = (
+    "name",
+    "email",
+    "phone",
+    "address",
+    "created_at",
+    "updated_at",
+    "city",
+    "state",
+    "zip_code",
+    "revision",
+    "disabled",
+)
+
+
+def clientEntity(db_item, fields=None) -> dict:
+    if isinstance(db_item, dict):
+        return clientDocumentEntity(db_item, fields)
+    entity = {
         "id": str(getattr(db_item, "id", getattr(db_item, "_id", ""))),
         "name": getattr(db_item, "name", None),
         "email": getattr(db_item, "email", None),
@@ -9,8 +31,90 @@ def clientEntity(db_item) -> dict:
         "updated_at": getattr(db_item, "updated_at", None),
         "city": getattr(db_item, "city", None),
         "state": getattr(db_item, "state", None),
-        "zip_code": getattr(db_item, "zip_code", None)
+        "zip_code": getattr(db_item, "zip_code", None),
+        "revision": getattr(db_item, "revision", None),
+        "disabled": getattr(db_item, "disabled", False),
+    }
+    if fields:
+        return {key: entity[key] for key in ("id", *fields)}
+    return entity
+
+
+def clientDocumentEntity(document: dict, fields=None) -> dict:
+    entity = {"id": str(document.get("_id", document.get("id", "")))}
+    for field in fields or CLIENT_FIELDS:
+        entity[field] = document.get(field)
+    return entity
+
+
+def list_clientEntity(db_items, fields=None) -> list:
+    return [clientEntity(item, fields) for item in db_items]
+
+
+def normalize_text(value: Optional[str]) -> str:
+    value = unicodedata.normalize("NFKD", value or "")
+    value = "".join(char for char in value if not unicodedata.combining(char))
+    return " ".join(value.lower().split())
+
+
+def normalize_email(value: Optional[str]) -> str:
+    return (value or "").strip().lower()
+
+
+def normalize_phone(value: Optional[str]) -> str:
+    return re.sub(r"\D", "", value or "")
+
+
+def clientSearchFields(db_item) -> dict:
+    source = db_item if isinstance(db_item, dict) else vars(db_item)
+    return {
+        "name_normalized": normalize_text(source.get("name")),
+        "email_normalized": normalize_email(source.get("email")),
+        "phone_normalized": normalize_phone(source.get("phone")),
+    }
+
+
+def clientETag(entity: dict) -> str:
+    return f'"{entity["id"]}:{entity.get("revision") or 0}"'
+
+
+def parse_client_etag(if_match: Optional[str], client_id: str) -> Optional[int]:
+    if not if_match or if_match.strip() == "*":
+        return None
+    value = if_match.strip()
+    if value.startswith("W/"):
+        value = value[2:]
+    try:
+        etag_id, revision = value.strip('"').rsplit(":", 1)
+        revision = int(revision)
+    except ValueError:
+        raise ValueError("Cabeçalho If-Match inválido.")
+    if etag_id != str(client_id):
+        raise PreconditionFailedError("O If-Match não corresponde a este cliente.")
+    return revision
+
+
+def parse_client_fields(fields: Optional[str]) -> Optional[tuple]:
+    if not fields:
+        return None
+    requested = tuple(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip() and f.strip() != "id"))
+    invalid = [f for f in requested if f not in CLIENT_FIELDS]
+    if invalid:
+        raise ValueError(f"Campos inválidos: {', '.join(invalid)}")
+    return requested or None
+
+
+def clientStatsEntity(stats: dict) -> dict:
+    status = {item["_id"]: item["count"] for item in stats.get("status", [])}
+    active, disabled = status.get(False, 0), status.get(True, 0)
+    return {
+        "total": active + disabled,
+        "active": active,
+        "disabled": disabled,
+        "by_state": [{"state": item["_id"], "count": item["count"]} for item in stats.get("by_state", [])],
+        "by_city": [
+            {"state": item["_id"].get("state"), "city": item["_id"].get("city"), "count": item["count"]}
+            for item in stats.get("by_city", [])
+        ],
+        "created_per_day": [{"date": item["_id"], "count": item["count"]} for item in stats.get("daily", [])],
     }
-    
-def list_clientEntity(db_items) -> list:
-    return [clientEntity(item) for item in db_items]
\ No newline at end of file
@@ -24,3 +24,29 @@ class UserResponse(BaseModel):
             username=user.username,
             email=user.email
         )
+
+    @staticmethod
+    def from_record(record):
+        return UserResponse.model_construct(
+            id=str(record.id),
+            name=record.name,
+            username=record.username,
+            email=record.email
+        )
+
+
+USER_RECORD_PROJECTION = {"name": 1, "username": 1, "email": 1}
+
+
+class UserRecord:
+    __slots__ = ("id", "name", "username", "email")
+
+    def __init__(self, id, name, username, email):
+        self.id = id
+        self.name = name
+        self.username = username
+        self.email = email
+
+    @classmethod
+    def from_document(cls, document: dict) -> "UserRecord":
+        return cls(document["_id"], document.get("name"), document.get("username"), document.get("email"))
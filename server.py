@@ -0,0 +1,107 @@
+import argparse
+import asyncio
+import importlib.util
+import logging
+import os
+import uvicorn
+from core.config import settings
+
+logger = logging.getLogger("server")
+
+
+def cpu_count() -> int:
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def process_local_state() -> list:
+    # estado que cada worker mantém só para si; com vários workers ele diverge entre processos
+    local = []
+    if settings.CLIENT_CACHE_BACKEND == "memory":
+        local.append("CLIENT_CACHE_BACKEND=memory")
+    if settings.RATE_LIMIT_BACKEND == "memory":
+        local.append("RATE_LIMIT_BACKEND=memory")
+    if settings.USER_CACHE_SIZE > 0 and settings.USER_CACHE_TTL_SECONDS > 0:
+        local.append("USER_CACHE_SIZE>0 (cache de usuários em memória)")
+    return local
+
+
+def default_workers() -> int:
+    if settings.SERVER_WORKERS > 0:
+        return settings.SERVER_WORKERS
+    if process_local_state():
+        return 1
+    return cpu_count()
+
+
+def _event_loop() -> str:
+    return "uvloop" if importlib.util.find_spec("uvloop") is not None else "asyncio"
+
+
+def _http_protocol() -> str:
+    return "httptools" if importlib.util.find_spec("httptools") is not None else "h11"
+
+
+async def backfill_search_fields() -> int:
+    # importados aqui para o processo mestre do servidor não abrir conexão com o banco
+    from core import database
+    from models.client import Client
+    from repositories.client_repository import ClientRepository
+
+    await database.connect([Client])
+    try:
+        return await ClientRepository.backfill_search_fields(settings.EXPORT_BATCH_SIZE)
+    finally:
+        database.close()
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Servidor de produção da API")
+    parser.add_argument("--host", default=settings.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=settings.SERVER_PORT)
+    parser.add_argument("--workers", type=int, default=default_workers())
+    parser.add_argument(
+        "--backfill-search",
+        action="store_true",
+        help="preenche os campos normalizados de busca dos clientes antigos e sai",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    if args.backfill_search:
+        updated = asyncio.run(backfill_search_fields())
+        logger.info("%s clientes com campos de busca preenchidos", updated)
+        return
+    loop, http = _event_loop(), _http_protocol()
+    if loop != "uvloop" or http != "httptools":
+        logger.warning("uvloop/httptools indisponíveis, usando loop=%s http=%s", loop, http)
+    local = process_local_state()
+    if args.workers > 1 and local:
+        raise SystemExit(
+            f"{args.workers} workers exigem estado compartilhado, mas há estado por processo: {', '.join(local)}. "
+            "Use CLIENT_CACHE_BACKEND=redis, RATE_LIMIT_BACKEND=redis e USER_CACHE_SIZE=0, ou um único worker."
+        )
+
+    # O app é passado como string para que cada worker o importe no próprio processo:
+    # Beanie, o pool do Motor, caches e executores são criados por worker, nunca herdados.
+    uvicorn.run(
+        "app:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        loop=loop,
+        http=http,
+        backlog=settings.SERVER_BACKLOG,
+        timeout_keep_alive=settings.SERVER_KEEPALIVE_SECONDS,
+        timeout_graceful_shutdown=settings.SERVER_GRACEFUL_SHUTDOWN_SECONDS,
+        access_log=settings.SERVER_ACCESS_LOG,
+        proxy_headers=True,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,32 +1,239 @@
+import asyncio
+import logging
+import re
 from repositories.client_repository import ClientRepository
-from schemas.client_schema import clientEntity, list_clientEntity
-from datetime import datetime
+from repositories.lease_repository import LeaseRepository
+from models.client import ClientCreateUpdate
+from pydantic import ValidationError
+from core.config import settings
+from schemas.client_schema import (
+    CLIENT_FIELDS,
+    clientEntity,
+    clientDocumentEntity,
+    clientETag,
+    clientStatsEntity,
+    list_clientEntity,
+    parse_client_fields,
+    normalize_email,
+    normalize_phone,
+    normalize_text,
+    parse_client_etag,
+)
+from core.conditional import make_etag
+from core.loader import unique_object_ids
+from core.pagination import clamp_page_size, encode_cursor, decode_cursor
+from core.streaming import clamp_batch_size, encode_rows
+from datetime import datetime, timedelta
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_LEASE = "client_archive"
+
 
 class ClientService:
-    async def list_clients(self):
+    async def list_validators(self, cursor=None, limit=None, fields=None):
+        version, last_modified = await ClientRepository.collection_version("clients.list")
+        return version, make_etag("clients", version, cursor, clamp_page_size(limit), fields), last_modified
+
+    async def list_clients(self, cursor=None, limit=None, fields=None, version=None):
+        after_id = decode_cursor(cursor)
+        page_size = clamp_page_size(limit)
+        selected = parse_client_fields(fields)
         try:
-            clients = await ClientRepository.list_clients()
-            return list_clientEntity(clients)
+            clients = await ClientRepository.list_client_documents(
+                after_id=after_id,
+                limit=page_size + 1,
+                fields=selected,
+                version=version,
+            )
         except Exception:
             raise Exception("Erro ao listar clientes.")
+        has_more = len(clients) > page_size
+        clients = clients[:page_size]
+        return {
+            "items": [clientDocumentEntity(client, selected) for client in clients],
+            "next_cursor": encode_cursor(clients[-1]["_id"]) if has_more else None,
+            "limit": page_size,
+        }
+
+    async def search_clients(self, q, mode="auto", city=None, state=None, disabled=None, limit=None, offset=0):
+        term = (q or "").strip()
+        if not term:
+            raise ValueError("Informe um termo de busca.")
+        if offset > settings.SEARCH_MAX_OFFSET:
+            raise ValueError(f"O deslocamento máximo da busca é {settings.SEARCH_MAX_OFFSET}.")
+        page_size = clamp_page_size(limit)
+        filters = {
+            key: value
+            for key, value in {"city": city, "state": state}.items()
+            if value is not None
+        }
+        filters["disabled"] = bool(disabled)
+
+        fallback = None
+        if mode == "auto":
+            if "@" in term:
+                mode = "email"
+            elif len(normalize_phone(term)) >= 3 and re.fullmatch(r"[\d\s()+.-]+", term):
+                mode = "phone"
+            else:
+                mode = "text"
+                fallback = "name"
+
+        query = {"filters": filters, "skip": offset, "limit": page_size + 1}
+        if mode == "email":
+            query.update(prefix_field="email_normalized", prefix=normalize_email(term))
+        elif mode == "phone":
+            query.update(prefix_field="phone_normalized", prefix=normalize_phone(term))
+        elif mode == "name":
+            query.update(prefix_field="name_normalized", prefix=normalize_text(term))
+        else:
+            query.update(text=term)
+        if "prefix_field" in query and not query["prefix"]:
+            # sem prefixo a busca devolveria a coleção inteira
+            raise ValueError(f"O termo não contém caracteres válidos para a busca por {mode}.")
+
+        try:
+            clients = await ClientRepository.search_clients(**query)
+            if not clients and fallback == "name" and offset == 0 and normalize_text(term):
+                mode = fallback
+                query.pop("text")
+                query.update(prefix_field="name_normalized", prefix=normalize_text(term))
+                clients = await ClientRepository.search_clients(**query)
+        except Exception:
+            raise Exception("Erro ao buscar clientes.")
+        has_more = len(clients) > page_size
+        clients = clients[:page_size]
+        items = []
+        for client in clients:
+            item = clientEntity(client)
+            if "score" in client:
+                item["score"] = client["score"]
+            items.append(item)
+        return {
+            "items": items,
+            "mode": mode,
+            "next_offset": offset + page_size if has_more else None,
+            "limit": page_size,
+        }
+
+    def cache_stats(self):
+        return ClientRepository.cache_stats()
+
+    async def client_stats(self, days=None, top=20):
+        days = days or settings.CLIENT_STATS_DAYS
+        since = datetime.combine(datetime.utcnow().date() - timedelta(days=days - 1), datetime.min.time())
+        stats = await ClientRepository.client_stats(since, top)
+        return {**clientStatsEntity(stats), "since": since.date().isoformat()}
+
+    async def page_around(self, client_db, limit=None):
+        page_size = clamp_page_size(limit)
+        before_size = max(0, (page_size - 1) // 2)
+        before = await ClientRepository.list_clients_before(client_db.id, limit=before_size) if before_size else []
+        remaining = max(0, page_size - len(before) - 1)
+        # sempre pede um a mais (limit >= 1) para saber se há próxima página
+        after = await ClientRepository.list_clients(after_id=client_db.id, limit=remaining + 1)
+        has_more = len(after) > remaining
+        clients = [*before, client_db, *after[:remaining]]
+        return {
+            "items": list_clientEntity(clients),
+            "next_cursor": encode_cursor(clients[-1].id) if has_more else None,
+            "limit": page_size,
+        }
+
+    def export_clients(self, fmt="ndjson", batch_size=None):
+        batch_size = clamp_batch_size(batch_size)
 
-    async def create_client(self, client):
+        async def rows():
+            async for client in ClientRepository.iter_client_documents(batch_size):
+                yield clientDocumentEntity(client)
+
+        return encode_rows(rows(), fmt, ("id", *CLIENT_FIELDS), batch_size)
+
+    async def create_client(self, client, response_mode="entity", limit=None):
         try:
-            duplicate = await ClientRepository.find_duplicate(client.email, client.phone)
-            if duplicate:
-                raise ValueError("Já existe um cliente com este e-mail ou telefone.")
             client_db = await ClientRepository.create_client(client)
-            return await self.list_clients()
+            if response_mode == "page":
+                return {
+                    "client": clientEntity(client_db),
+                    "page": await self.page_around(client_db, limit),
+                }
+            return clientEntity(client_db)
         except ValueError as ve:
             raise ve
         except Exception:
             raise Exception("Erro interno ao criar cliente.")
 
-    async def get_client(self, client_id):
+    async def import_clients(self, rows):
+        results = [None] * len(rows)
+        valid = []
+        seen_emails, seen_phones = set(), set()
+        for index, row in enumerate(rows):
+            try:
+                client = ClientCreateUpdate.model_validate(row)
+            except ValidationError as ve:
+                fields = ", ".join(str(error["loc"][0]) for error in ve.errors() if error["loc"])
+                results[index] = {"row": index, "status": "invalid", "error": f"Dados inválidos: {fields or 'registro'}"}
+                continue
+            if client.email in seen_emails or client.phone in seen_phones:
+                results[index] = {"row": index, "status": "duplicate", "error": "Registro duplicado no lote."}
+                continue
+            seen_emails.add(client.email)
+            seen_phones.add(client.phone)
+            valid.append((index, client))
+
+        try:
+            existing_emails, existing_phones = await ClientRepository.find_existing_contacts(seen_emails, seen_phones)
+            to_insert = []
+            for index, client in valid:
+                if client.email in existing_emails or client.phone in existing_phones:
+                    results[index] = {"row": index, "status": "duplicate", "error": "Já existe um cliente com este e-mail ou telefone."}
+                else:
+                    to_insert.append((index, client))
+            inserted = await ClientRepository.insert_many([client for _, client in to_insert], settings.IMPORT_CHUNK_SIZE)
+        except Exception:
+            raise Exception("Erro interno ao importar clientes.")
+
+        for (index, _), (client_id, error_code) in zip(to_insert, inserted):
+            if error_code is None:
+                results[index] = {"row": index, "status": "created", "id": str(client_id)}
+            elif error_code == 11000:
+                results[index] = {"row": index, "status": "duplicate", "error": "Já existe um cliente com este e-mail ou telefone."}
+            else:
+                results[index] = {"row": index, "status": "error", "error": "Erro ao inserir registro."}
+
+        summary = {"total": len(rows), "created": 0, "duplicate": 0, "invalid": 0, "error": 0}
+        for result in results:
+            summary[result["status"]] += 1
+        return {**summary, "results": results}
+
+    async def client_validators(self, client_id):
+        document = await ClientRepository.get_client_validators(client_id)
+        if not document:
+            return None
+        revision = document.get("revision") or 0
+        etag = clientETag({"id": str(document["_id"]), "revision": revision})
+        return etag, document.get("updated_at") or document.get("created_at"), revision
+
+    def stream_changes(self, last_event_id=None):
+        return ClientRepository.stream_changes(last_event_id)
+
+    async def get_clients_batch(self, ids):
+        client_ids = unique_object_ids(ids, settings.BATCH_MAX_IDS)
         try:
-            client = await ClientRepository.get_client(client_id)
+            documents = await ClientRepository.get_client_documents(client_ids)
+        except Exception:
+            raise Exception("Erro ao buscar clientes.")
+        return {
+            "items": [clientDocumentEntity(documents[client_id]) for client_id in client_ids if client_id in documents],
+            "missing": [str(client_id) for client_id in client_ids if client_id not in documents],
+        }
+
+    async def get_client(self, client_id, revision=None):
+        try:
+            client = await ClientRepository.get_client_document(client_id, revision)
             if client:
-                return clientEntity(client)
+                return clientDocumentEntity(client)
             else:
                 raise ValueError("Client not found")
         except ValueError as ve:
@@ -34,15 +241,21 @@ class ClientService:
         except Exception:
             raise Exception("Erro ao buscar cliente.")
 
-    async def update_client(self, client_id, client):
+    async def update_client(self, client_id, client, if_match=None):
+        return await self._apply_update(client_id, dict(client), if_match)
+
+    async def patch_client(self, client_id, client, if_match=None):
+        changes = client.model_dump(exclude_unset=True, exclude_none=True)
+        if not changes:
+            raise ValueError("Nenhum campo para atualizar.")
+        return await self._apply_update(client_id, changes, if_match)
+
+    async def _apply_update(self, client_id, changes, if_match):
+        expected_revision = parse_client_etag(if_match, client_id)
         try:
-            client_db = await ClientRepository.get_client(client_id)
-            if not client_db:
+            updated_client = await ClientRepository.update_client(client_id, changes, expected_revision)
+            if not updated_client:
                 raise ValueError("Client not found")
-            duplicate = await ClientRepository.find_duplicate(client.email, client.phone, exclude_id=client_id)
-            if duplicate:
-                raise ValueError("Já existe outro cliente com este e-mail ou telefone.")
-            updated_client = await ClientRepository.update_client(client_id, client, client_db.created_at)
             return clientEntity(updated_client)
         except ValueError as ve:
             raise ve
@@ -51,7 +264,7 @@ class ClientService:
 
     async def delete_client(self, client_id):
         try:
-            client = await ClientRepository.delete_client(client_id)
+            client = await ClientRepository.set_client_disabled(client_id, True)
             if not client:
                 raise ValueError("Client not found")
             return {"message": "Client deleted successfully"}
@@ -59,3 +272,31 @@ class ClientService:
             raise ve
         except Exception:
             raise Exception("Erro ao deletar cliente.")
+
+    async def restore_client(self, client_id):
+        try:
+            client = await ClientRepository.set_client_disabled(client_id, False)
+            if not client:
+                raise ValueError("Client not found")
+            return clientDocumentEntity(client)
+        except ValueError as ve:
+            raise ve
+        except Exception:
+            raise Exception("Erro ao restaurar cliente.")
+
+    async def archive_disabled_clients(self, days=None, batch_size=None):
+        disabled_before = datetime.utcnow() - timedelta(days=days or settings.CLIENT_ARCHIVE_AFTER_DAYS)
+        return await ClientRepository.archive_disabled(disabled_before, batch_size or settings.CLIENT_ARCHIVE_BATCH_SIZE)
+
+    async def run_archive_loop(self, interval):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                # todos os workers rodam o laço; só o dono do lease arquiva
+                if not await LeaseRepository.acquire(ARCHIVE_LEASE, interval * 2):
+                    continue
+                archived = await self.archive_disabled_clients()
+                if archived:
+                    logger.info("%s clientes desativados movidos para o arquivo", archived)
+            except Exception as e:
+                logger.warning("Falha ao arquivar clientes desativados: %s", e)
@@ -0,0 +1,95 @@
+import asyncio
+import calendar
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+from core.config import settings
+from repositories.token_repository import RevokedTokenRepository
+
+logger = logging.getLogger(__name__)
+
+
+def _timestamp(value: datetime) -> float:
+    return calendar.timegm(value.utctimetuple())
+
+
+def _timestamp_ms(value: datetime) -> int:
+    return calendar.timegm(value.utctimetuple()) * 1000 + value.microsecond // 1000
+
+
+class TokenRevocationStore:
+    def __init__(self, sync_overlap_seconds: float = 5):
+        self.sync_overlap = timedelta(seconds=sync_overlap_seconds)
+        self._revoked: Dict[str, float] = {}
+        self._user_cutoffs: Dict[str, tuple] = {}
+        self._last_sync: Optional[datetime] = None
+        self.checks = 0
+        self.rejections = 0
+
+    def is_revoked(self, jti: Optional[str], user_id: Optional[str], issued_at: Optional[float]) -> bool:
+        self.checks += 1
+        revoked = jti is not None and jti in self._revoked
+        if not revoked and user_id is not None:
+            cutoff = self._user_cutoffs.get(user_id)
+            # iat e o corte comparados em milissegundos inteiros: um login logo após a revogação continua válido
+            revoked = cutoff is not None and (issued_at is None or round(issued_at * 1000) < cutoff[0])
+        if revoked:
+            self.rejections += 1
+        return revoked
+
+    def _apply(self, entry: dict) -> None:
+        expires_at = _timestamp(entry["expires_at"])
+        if entry.get("not_before") is not None:
+            self._user_cutoffs[entry["user_id"]] = (_timestamp_ms(entry["not_before"]), expires_at)
+        else:
+            self._revoked[entry["jti"]] = expires_at
+
+    def _prune(self, now: float) -> None:
+        self._revoked = {jti: expires for jti, expires in self._revoked.items() if expires > now}
+        self._user_cutoffs = {user: cutoff for user, cutoff in self._user_cutoffs.items() if cutoff[1] > now}
+
+    async def revoke(self, jti: str, user_id: str, expires_at: int) -> bool:
+        if jti in self._revoked:
+            return False
+        now = datetime.utcnow()
+        inserted = await RevokedTokenRepository.insert(jti, user_id, now, datetime.utcfromtimestamp(expires_at))
+        self._revoked[jti] = expires_at
+        return inserted
+
+    async def revoke_user(self, user_id: str) -> None:
+        now = datetime.utcnow()
+        # o BSON guarda datas em milissegundos; trunca já aqui para o corte local e o sincronizado coincidirem
+        not_before = now.replace(microsecond=now.microsecond // 1000 * 1000)
+        lifetime = max(settings.ACCESS_TOKEN_EXPIRE_MINUTES, settings.ACCESS_REFRESH_TOKEN_SECRET_KEY)
+        expires_at = not_before + timedelta(minutes=lifetime)
+        await RevokedTokenRepository.set_user_cutoff(user_id, not_before, expires_at)
+        self._apply({"user_id": user_id, "not_before": not_before, "expires_at": expires_at})
+
+    async def sync(self) -> int:
+        now = datetime.utcnow()
+        since = self._last_sync - self.sync_overlap if self._last_sync else None
+        entries = await RevokedTokenRepository.list_active(now, since)
+        for entry in entries:
+            self._apply(entry)
+        self._prune(_timestamp(now))
+        self._last_sync = now
+        return len(entries)
+
+    async def run_sync_loop(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.sync()
+            except Exception as e:
+                logger.warning("Falha ao sincronizar tokens revogados: %s", e)
+
+    def stats(self) -> dict:
+        return {
+            "revoked": len(self._revoked),
+            "revoked_users": len(self._user_cutoffs),
+            "checks": self.checks,
+            "rejections": self.rejections,
+        }
+
+
+revocation_store = TokenRevocationStore()
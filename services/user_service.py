@@ -1,10 +1,17 @@
 from models.user import User
 from schemas.user_schema import UserCreate, UserUpdate,UserResponse
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 from beanie import PydanticObjectId
-from core.security import create_password, verify_password
+from core.security import create_password_async, verify_password_async
 from repositories.user_repository import UserRepository
 from schemas.user_schema import UserResponse
+from core.streaming import clamp_batch_size, encode_rows
+from core.cache import TTLCache
+from core.loader import unique_object_ids
+from core.config import settings
+from services.token_service import revocation_store
+
+user_cache = TTLCache(maxsize=settings.USER_CACHE_SIZE, ttl=settings.USER_CACHE_TTL_SECONDS)
 
 class UserService:
     @staticmethod
@@ -20,7 +27,7 @@ class UserService:
         else:
             username = name_parts[0].lower()
             
-        hashed_password = create_password(username)
+        hashed_password = await create_password_async(username)
             
         user_dict["username"] = username
         user_dict["hash_password"] = hashed_password
@@ -36,10 +43,40 @@ class UserService:
             return UserResponse.from_user(user)
         return None
 
+    @staticmethod
+    async def collection_version(route: str = "users.get"):
+        return await UserRepository.collection_version(route)
+
     @staticmethod
     async def get_all_users() -> List[UserResponse]:
-        users = await UserRepository.get_all_users()
-        return [UserResponse.from_user(user) for user in users]
+        users = await UserRepository.get_all_user_records()
+        return [UserResponse.from_record(user) for user in users]
+
+    @staticmethod
+    async def get_users_batch(ids: List[str]) -> dict:
+        user_ids = unique_object_ids(ids, settings.BATCH_MAX_IDS)
+        records = await UserRepository.get_user_records(user_ids)
+        return {
+            "items": [UserResponse.from_record(records[user_id]) for user_id in user_ids if user_id in records],
+            "missing": [str(user_id) for user_id in user_ids if user_id not in records],
+        }
+
+    @staticmethod
+    async def get_user_response(user_id: PydanticObjectId) -> Optional[UserResponse]:
+        user = await UserRepository.get_user_record(user_id)
+        if user:
+            return UserResponse.from_record(user)
+        return None
+
+    @staticmethod
+    def export_users(fmt: str = "ndjson", batch_size: Optional[int] = None) -> AsyncIterator[bytes]:
+        batch_size = clamp_batch_size(batch_size)
+
+        async def rows():
+            async for user in UserRepository.iter_user_records(batch_size):
+                yield {"id": str(user.id), "name": user.name, "username": user.username, "email": user.email}
+
+        return encode_rows(rows(), fmt, UserResponse.model_fields.keys(), batch_size)
 
     @staticmethod
     async def update_user(user_data: UserUpdate) -> Optional[UserResponse]:
@@ -52,6 +89,7 @@ class UserService:
             user.name = user_data.name
             user.email = user_data.email            
             user = await UserRepository.update_user(user)
+            user_cache.pop(str(user.id))
             return UserResponse.from_user(user)
         return None
 
@@ -60,6 +98,8 @@ class UserService:
         user = await UserRepository.get_user_by_id(user_id)
         if user:
             await UserRepository.delete_user(user)
+            user_cache.pop(str(user.id))
+            await revocation_store.revoke_user(str(user.id))
             return True
         return False
     
@@ -73,11 +113,21 @@ class UserService:
     @staticmethod
     async def authenticate_user(email: str, password: str) -> Optional[UserResponse]:
         user = await UserRepository.get_user_by_username(email)
-        if user and verify_password(password, user.hash_password):
-            return UserResponse.from_user(user)
-        return None
+        if not user:
+            return None
+        valid, new_hash = await verify_password_async(password, user.hash_password)
+        if not valid:
+            return None
+        if new_hash:
+            await UserRepository.update_password_hash(user, new_hash)
+            user_cache.pop(str(user.id))
+        return UserResponse.from_user(user)
 
     @staticmethod
     async def get_user_by_id(id: str) -> Optional[UserResponse]:
-        user = await UserRepository.get_user_by_id(PydanticObjectId(id))
+        user = user_cache.get(str(id))
+        if user is None:
+            user = await UserRepository.load_user(PydanticObjectId(id))
+            if user:
+                user_cache.set(str(id), user)
         return user
\ No newline at end of file